@@ -7,7 +7,7 @@ from flask_sqlalchemy import SQLAlchemy
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-from inertia_flask import Inertia, defer, inertia
+from inertia_flask import Inertia, cached, defer, inertia
 
 
 class Base(DeclarativeBase):
@@ -76,7 +76,10 @@ def hello_world():
     # post = Posts.query.first()
     return {
         "value": 1,
-        "defer": defer(get_posts, group="test"),
+        "defer": defer(
+            cached(get_posts, key="posts", ttl=60, stale_ttl=300, tags="posts"),
+            group="test",
+        ),
         "other": defer(lambda: [f"{randint(1, 9)}"], group="test", merge=True),
     }
 
@@ -13,5 +13,6 @@ createServer(page =>
       return pages[`./Pages/${name}.tsx`]
     },
     setup: ({ App, props }) => <App {...props} />
-  })
-)
\ No newline at end of file
+  }),
+  Number(process.env.INERTIA_SSR_PORT) || 13714
+)
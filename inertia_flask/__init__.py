@@ -1,4 +1,6 @@
+from .cache import invalidate_cached
 from .extension import Inertia, InertiaInitializationError
+from .flash import flash, with_errors
 from .responses import (
     InertiaResponse,
     clear_history,
@@ -7,7 +9,7 @@ from .responses import (
     location,
     render,
 )
-from .utils import defer, lazy, merge, optional
+from .utils import cached, defer, lazy, merge, once, optional, raw_json, scroll
 from .version import get_asset_version as _get_asset_version
 
 __all__ = [
@@ -18,10 +20,17 @@ __all__ = [
     "render",
     "clear_history",
     "encrypt_history",
+    "flash",
+    "with_errors",
+    "cached",
+    "invalidate_cached",
     "defer",
     "lazy",
     "merge",
+    "once",
     "optional",
+    "raw_json",
+    "scroll",
     "Inertia",
     "_get_asset_version",
 ]
@@ -0,0 +1,88 @@
+"""Artifacts computed once at build or warmup time and shared by every worker"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from .helpers import write_atomic
+
+
+class SharedArtifacts:
+    """Asset versions and parsed manifests read from ``INERTIA_CACHE_FILE``.
+
+    ``flask inertia warmup`` writes the file once per build, so workers load
+    its results instead of hashing templates and parsing manifests themselves.
+    The file is swapped in atomically and re-read whenever it is replaced. It
+    is ignored as a whole once one of its manifests is rebuilt, so versions
+    and manifests always switch together.
+    """
+
+    def __init__(self):
+        self._stamp = None
+        self._data = {}
+        # Per thread, so a warmup does not affect requests served meanwhile
+        self._local = threading.local()
+
+    def load(self, path):
+        """Return the stored artifacts, or an empty dict if there are none."""
+        if getattr(self._local, "suspended", False):
+            return {}
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._stamp, self._data = None, {}
+            return self._data
+
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with open(path, "rb") as content:
+                self._data = json.load(content)
+            self._stamp = stamp
+        return self._data
+
+    def current(self, path, root_path=None):
+        """Return the stored artifacts, unless a manifest was rebuilt since.
+
+        :param root_path: Directory the stored manifest paths are relative to
+        """
+        data = self.load(path)
+        if root_path is None or not data:
+            return data
+        for manifest_path in data.get("manifests", {}):
+            try:
+                source = os.stat(os.path.join(root_path, manifest_path))
+            except OSError:
+                continue
+            if source.st_mtime_ns > self._stamp[1]:
+                # Rebuilt since the last warmup
+                return {}
+        return data
+
+    def get_version(self, path, blueprint, root_path=None):
+        versions = self.current(path, root_path).get("versions", {})
+        return versions.get(blueprint or "")
+
+    def get_manifest(self, path, manifest_path, root_path=None):
+        manifests = self.current(path, root_path).get("manifests", {})
+        return manifests.get(manifest_path)
+
+    @contextmanager
+    def rebuilding(self):
+        """Ignore the stored artifacts while computing their replacement."""
+        self._local.suspended = True
+        try:
+            yield
+        finally:
+            self._local.suspended = False
+
+    def write(self, path, versions, manifests):
+        """Atomically replace the artifact file at ``path``."""
+        data = {
+            "versions": {
+                blueprint or "": version for blueprint, version in versions.items()
+            },
+            "manifests": manifests,
+        }
+        write_atomic(path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        self._stamp, self._data = None, {}
@@ -0,0 +1,138 @@
+"""Serving Vite's build output with long-lived caching and precompressed files"""
+
+import gzip
+import mimetypes
+import os
+import re
+
+from flask import abort, send_file
+from werkzeug.security import safe_join
+
+# Vite writes build output to ``build.assetsDir`` as ``[name]-[hash].[ext]``,
+# with an 8 character hash
+VITE_ASSETS_DIR = "assets"
+HASHED_ASSET = re.compile(r"[-.](?=[\w-]*\d)[\w-]{8}\.[A-Za-z0-9]+$")
+IMMUTABLE_MAX_AGE = 31536000
+COMPRESSIBLE_EXTENSIONS = (
+    ".js",
+    ".mjs",
+    ".css",
+    ".html",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+    ".wasm",
+)
+COMPRESS_MIN_SIZE = 1024
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def is_hashed(filename, manifest_files=None):
+    """Whether ``filename`` carries a content hash and can be cached forever.
+
+    :param manifest_files: The files listed in the Vite manifest, which decide
+        when given. Otherwise the file must be in Vite's assets directory and
+        its name end in a hash with a digit, unlike e.g. ``site-manifest.json``.
+    """
+    if manifest_files is not None:
+        return filename in manifest_files
+    return (
+        filename.startswith(f"{VITE_ASSETS_DIR}/")
+        and HASHED_ASSET.search(os.path.basename(filename)) is not None
+    )
+
+
+def send_asset(directory, filename, accept_encodings, hashed=None):
+    """Send ``filename`` from ``directory``, preferring a precompressed sibling.
+
+    A ``.br`` or ``.gz`` file next to the asset is sent as is when the client
+    accepts that encoding, unless it is older than the asset. Files go through
+    ``send_file``, so servers providing ``wsgi.file_wrapper`` send them without
+    copying them through Python.
+
+    :param accept_encodings: The request's parsed ``Accept-Encoding`` header
+    :param hashed: Whether the file can be cached forever, from its name if ``None``
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if hashed is None:
+        hashed = is_hashed(filename)
+    max_age = IMMUTABLE_MAX_AGE if hashed else None
+
+    mtime = os.stat(path).st_mtime_ns
+    for encoding, suffix in ENCODINGS:
+        if not accept_encodings[encoding]:
+            continue
+        try:
+            # Compressed from a previous version of the file
+            if os.stat(path + suffix).st_mtime_ns < mtime:
+                continue
+        except OSError:
+            continue
+        response = send_file(path + suffix, mimetype=mimetype, max_age=max_age)
+        response.headers["Content-Encoding"] = encoding
+        break
+    else:
+        response = send_file(path, mimetype=mimetype, max_age=max_age)
+
+    response.vary.add("Accept-Encoding")
+    if hashed:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    return response
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress_assets(directory):
+    """Write ``.gz`` (and ``.br``, when ``brotli`` is installed) siblings of assets.
+
+    Files that are small, not text-like, or whose compressed siblings are
+    already newer than them are skipped. Returns the number of files written.
+    """
+    brotli = _brotli()
+    written = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            if stat.st_size < COMPRESS_MIN_SIZE:
+                continue
+
+            data = None
+            for suffix, compress in (
+                (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+                (".br", brotli.compress if brotli else None),
+            ):
+                if compress is None:
+                    continue
+                try:
+                    if os.stat(path + suffix).st_mtime_ns >= stat.st_mtime_ns:
+                        continue
+                except OSError:
+                    pass
+                if data is None:
+                    with open(path, "rb") as content:
+                        data = content.read()
+                compressed = compress(data)
+                # Not worth a round trip through the decoder
+                if len(compressed) >= len(data):
+                    continue
+                with open(path + suffix, "wb") as content:
+                    content.write(compressed)
+                written += 1
+    return written
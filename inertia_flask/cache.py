@@ -0,0 +1,147 @@
+"""Memoization of expensive props across requests"""
+
+import os
+import threading
+import time
+
+from flask import (
+    copy_current_request_context,
+    current_app,
+    has_request_context,
+)
+
+CACHE_KEY_PREFIX = "inertia:prop:"
+CACHE_TAG_PREFIX = "inertia:tag:"
+
+
+class MemoryCache:
+    """A per-process cache, used when ``INERTIA_CACHE_BACKEND`` is not set.
+
+    Any object with the same ``get``/``set``/``delete`` methods can be used as
+    a backend instead, e.g. a ``cachelib`` cache or a Flask-Caching instance,
+    to share cached props between workers. A ``timeout`` of ``0`` never expires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return None
+        return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+
+class PropCache:
+    """Resolves cached props through a cache backend.
+
+    Entries are stored as ``(value, fresh_until, tag_versions)``. Invalidating
+    a tag gives it a new version, so entries stored under the old one are
+    recomputed on their next read, in every worker sharing the backend.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self._lock = threading.Lock()
+        self._refreshing = {}
+
+    def tag_versions(self, tags):
+        return tuple(self.backend.get(CACHE_TAG_PREFIX + tag) for tag in tags)
+
+    def get(self, prop):
+        """Return the value of ``prop``, from the cache when it is still usable."""
+        entry = self.backend.get(CACHE_KEY_PREFIX + prop.key)
+        if entry is not None:
+            value, fresh_until, tag_versions = entry
+            if tuple(tag_versions) == self.tag_versions(prop.tags):
+                now = time.time()
+                if fresh_until is None or now < fresh_until:
+                    return value
+                if now < fresh_until + prop.stale_ttl:
+                    self.refresh_later(prop)
+                    return value
+        return self.refresh(prop)
+
+    def refresh(self, prop):
+        """Resolve ``prop`` and store its value."""
+        # Read before resolving, so an invalidation meanwhile is not lost
+        tag_versions = self.tag_versions(prop.tags)
+        value = prop.resolve()
+        if prop.ttl is None:
+            fresh_until, timeout = None, 0
+        else:
+            fresh_until = time.time() + prop.ttl
+            timeout = prop.ttl + prop.stale_ttl
+        self.backend.set(
+            CACHE_KEY_PREFIX + prop.key,
+            (value, fresh_until, tag_versions),
+            timeout=timeout,
+        )
+        return value
+
+    def refresh_later(self, prop):
+        """Refresh ``prop`` in a background thread, once per key at a time."""
+
+        def refresh():
+            try:
+                self.refresh(prop)
+            except Exception:
+                current_app.logger.exception(
+                    f"Refreshing cached prop {prop.key} failed"
+                )
+            finally:
+                with self._lock:
+                    self._refreshing.pop(prop.key, None)
+
+        if has_request_context():
+            # The resolver may read the request, e.g. the current user
+            target = copy_current_request_context(refresh)
+        else:
+            app = current_app._get_current_object()
+
+            def target():
+                with app.app_context():
+                    refresh()
+
+        with self._lock:
+            if prop.key in self._refreshing:
+                return
+            thread = threading.Thread(target=target, daemon=True)
+            self._refreshing[prop.key] = thread
+        thread.start()
+
+    def wait(self, timeout=None):
+        """Wait for the background refreshes in progress to finish."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def invalidate(self, tags=(), keys=()):
+        """Expire the entries stored under any of ``tags``, and the ``keys``."""
+        for tag in tags:
+            self.backend.set(CACHE_TAG_PREFIX + tag, os.urandom(16).hex(), timeout=0)
+        for key in keys:
+            self.backend.delete(CACHE_KEY_PREFIX + key)
+
+
+def invalidate_cached(*tags, keys=()):
+    """Expire the cached props tagged with any of ``tags``, and those in ``keys``."""
+    current_app.extensions["inertia"].prop_cache().invalidate(tags, keys)
@@ -1,13 +1,18 @@
+import hashlib
 import os
 import shutil
-import subprocess
 import sys
-import threading
-import time
+from urllib.parse import urlsplit
 
 import click
 from flask import Blueprint, Flask, current_app
-from flask.cli import AppGroup
+from flask.cli import AppGroup, ScriptInfo
+
+from .assets import compress_assets
+from .helpers import write_atomic
+from .ssr import ssr_urls
+from .supervisor import DevServer, Supervisor, run_parallel
+from .vite import VITE_HOT_FILE
 
 
 def get_package_manager(root_path):
@@ -24,6 +29,72 @@ def get_package_manager(root_path):
         return "npm"
 
 
+BUILD_FINGERPRINT = ".inertia-build"
+INSTALL_FINGERPRINT = ".inertia-install"
+DEPENDENCY_FILES = ("package.json", "pnpm-lock.yaml", "yarn.lock", "package-lock.json")
+FINGERPRINT_EXCLUDE = ("node_modules", "dist")
+# Printed by Vite once the dev server accepts connections
+# Vite prints the URL it listens on, which differs from the configured one
+# when the port is taken
+VITE_READY = r"Local:\s+(?P<origin>https?://[^\s/]+)"
+
+
+def fingerprint(root_path, files=None, exclude=()):
+    """Hash the contents of ``files``, or of every source file under ``root_path``.
+
+    Contents are hashed rather than modification times, so fresh checkouts of
+    unchanged sources (e.g. in CI) still match.
+
+    :param exclude: Directories to leave out, e.g. the build output
+    """
+    if files is None:
+        files = []
+        exclude = {os.path.normcase(os.path.abspath(path)) for path in exclude}
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            dirnames[:] = [
+                name
+                for name in dirnames
+                if not name.startswith(".")
+                and name not in FINGERPRINT_EXCLUDE
+                and os.path.normcase(os.path.abspath(os.path.join(dirpath, name)))
+                not in exclude
+            ]
+            for filename in filenames:
+                if filename not in (
+                    BUILD_FINGERPRINT,
+                    INSTALL_FINGERPRINT,
+                    VITE_HOT_FILE,
+                ):
+                    files.append(
+                        os.path.relpath(os.path.join(dirpath, filename), root_path)
+                    )
+
+    digest = hashlib.sha256()
+    for filename in sorted(files):
+        path = os.path.join(root_path, filename)
+        if not os.path.isfile(path):
+            continue
+        digest.update(filename.replace(os.sep, "/").encode("utf-8") + b"\0")
+        with open(path, "rb") as content:
+            for chunk in iter(lambda: content.read(65536), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_fingerprint(path):
+    try:
+        with open(path, encoding="utf-8") as content:
+            return content.read().strip()
+    except OSError:
+        return None
+
+
+def write_fingerprint(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as content:
+        content.write(value)
+
+
 class InertiaCommands:
     """
     Command line utilities to interface with Inertia
@@ -34,7 +105,17 @@ class InertiaCommands:
     - `flask vite dev`: create a dev server to utilize HMR
     - `flask vite install`: install dependencies according to package manager
 
+    Inertia commands:
+
+    - `flask inertia routes`: list every Inertia page and its rendering options
+    - `flask inertia warmup`: precompute templates, asset versions and manifests
+    - `flask inertia prerender`: render static Inertia pages to HTML/JSON files
+    - `flask inertia ssr`: run and supervise the SSR render workers
+
     The vite commands prefer pnpm, then yarn, then npm. pnpm is recommended.
+    Builds and installs run in parallel for the app's `INERTIA_VITE_DIR` and
+    every `<BP>_INERTIA_VITE_DIR`. They are skipped when the sources or lockfile
+    did not change since the last successful run, unless `--force` is passed.
     """
 
     def __init__(self, inertia_instance, app=None):
@@ -62,45 +143,46 @@ class InertiaCommands:
         """Register CLI commands with the Flask app"""
         # inertia_group = AppGroup("inertia", help="Inertia integration commands")
 
-        @click.command(name="inertia")
+        @click.group(name="inertia", cls=AppGroup, invoke_without_command=True)
         @click.option("--debug", is_flag=True, help="Enable debug mode")
-        def inertia_group(debug):
+        @click.pass_context
+        def inertia_group(ctx, debug):
             """Build Inertia assets for production"""
+            if ctx.invoked_subcommand is not None:
+                return
             if debug:
                 current_app.config["DEBUG"] = True
-                vite_process = self.vite_dev()
-                vite_thread = threading.Thread(
-                    target=self._stream_output, args=(vite_process, "vite")
-                )
-                vite_thread.daemon = True
-                vite_thread.start()
-                try:
-                    # Keep the main thread running
-                    while True:
-                        if vite_process is not None and vite_process.poll() is not None:
-                            print("Vite server stopped unexpectedly")
-                            break
-                        # if flask_process.poll() is not None:
-                        #     print("Flask server stopped unexpectedly")
-                        #     break
-                        time.sleep(1)
-                except KeyboardInterrupt:
-                    print("\nShutting down servers...")
-                finally:
-                    # Ensure both processes are terminated
-                    if vite_process is not None:
-                        vite_process.terminate()
-                        # flask_process.terminate()
-                        try:
-                            vite_process.wait(timeout=5)
-                            # flask_process.wait(timeout=5)
-                        except subprocess.TimeoutExpired:
-                            vite_process.kill()
-                        # flask_process.kill()
+                self._vite_dev()
             else:
                 current_app.config["DEBUG"] = False
                 self._vite_build()
 
+        @inertia_group.command("warmup")
+        def warmup_command():
+            """Precompute templates, asset versions, manifest and SSR connection"""
+            self._warmup()
+
+        @inertia_group.command("routes")
+        def routes_command():
+            """List every Inertia page and its rendering options"""
+            self._routes()
+
+        @inertia_group.command("prerender")
+        def prerender_command():
+            """Prerender static Inertia pages to HTML and JSON files"""
+            self._prerender()
+
+        @inertia_group.command("ssr")
+        @click.option(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of SSR workers (default: INERTIA_SSR_WORKERS)",
+        )
+        def ssr_command(workers):
+            """Run and supervise the SSR render workers"""
+            self._ssr(workers)
+
         return inertia_group
 
     def register_vite(self):
@@ -110,9 +192,14 @@ class InertiaCommands:
 
         # Add the build command
         @vite_group.command("build")
-        def vite_build_command():
+        @click.option("--force", is_flag=True, help="Build even if nothing changed")
+        @click.option("--jobs", type=int, default=None, help="Maximum parallel builds")
+        @click.option(
+            "--compress", is_flag=True, help="Write .gz and .br copies of the assets"
+        )
+        def vite_build_command(force, jobs, compress):
             """Build Vite assets for production"""
-            self._vite_build()
+            self._vite_build(force=force, jobs=jobs, compress=compress)
 
         # Add the dev command
         @vite_group.command("dev")
@@ -121,101 +208,292 @@ class InertiaCommands:
             self._vite_dev()
 
         @vite_group.command("install")
-        def vite_install_command():
+        @click.option("--force", is_flag=True, help="Install even if nothing changed")
+        @click.option(
+            "--jobs", type=int, default=None, help="Maximum parallel installs"
+        )
+        def vite_install_command(force, jobs):
             """Install Vite dependencies"""
-            self._vite_install()
+            self._vite_install(force=force, jobs=jobs)
 
         return vite_group
 
-    def _run_vite_dev(self):
-        """Run Vite dev server in a separate thread"""
-        vite_dir = current_app.config.get("INERTIA_VITE_DIR")
-        vite_dir_path = os.path.join(current_app.root_path, vite_dir)
-
-        # Check if package.json exists
-        if not os.path.exists(os.path.join(vite_dir_path, "package.json")):
-            print(f"Error: No package.json found in {vite_dir_path}")
-            return
-
-        # Determine package manager (npm, yarn, pnpm)
-        package_manager = get_package_manager(vite_dir_path)
-
-        # Run Vite dev server
-        os.chdir(vite_dir_path)
-        process = subprocess.Popen([package_manager, "run", "dev"])
-        return process
+    def _flask_run_args(self):
+        """Command line running this app's Flask dev server with the reloader"""
+        args = [sys.executable, "-m", "flask"]
+        ctx = click.get_current_context(silent=True)
+        info = ctx.find_object(ScriptInfo) if ctx is not None else None
+        if info is not None and info.app_import_path:
+            args += ["--app", info.app_import_path]
+        return args + ["run", "--debug"]
 
     def _vite_dev(self):
-        """Run Flask and Vite dev servers together"""
-        # Start Vite in a separate thread
-        app = current_app._get_current_object()
-
-        def target():
-            with app.app_context():
-                self._run_vite_dev()
-
-        vite_thread = threading.Thread(target=target)
-        vite_thread.daemon = True
-        vite_thread.start()
+        """Run Flask and the Vite dev servers together"""
+        server = DevServer()
+        hot_files = []
+        for name, vite_dir_path, _ in self._frontends():
+            if not os.path.exists(os.path.join(vite_dir_path, "package.json")):
+                print(f"Error: No package.json found in {vite_dir_path}")
+                continue
+            package_manager = get_package_manager(vite_dir_path)
+            hot_file = os.path.join(vite_dir_path, VITE_HOT_FILE)
+            hot_files.append(hot_file)
+            server.add(
+                name,
+                [package_manager, "run", "dev"],
+                ready=VITE_READY,
+                on_ready=lambda match, hot_file=hot_file: write_atomic(
+                    hot_file, match.group("origin").encode("utf-8")
+                ),
+                cwd=vite_dir_path,
+            )
+        server.add(
+            "flask",
+            self._flask_run_args(),
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        )
         try:
-            # Keep the main thread running
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\nShutting down vite server...")
-
-    def _vite_build(self):
-        """Build Vite assets for production"""
-        vite_dir = current_app.config.get("INERTIA_VITE_DIR", "react")
-        vite_dir_path = os.path.join(current_app.root_path, vite_dir)
-
-        # Determine package manager
-        package_manager = get_package_manager(vite_dir_path)
-
-        # Run build
-        os.chdir(vite_dir_path)
-        subprocess.run([package_manager, "run", "build"], check=True)
-        print(f"Vite assets built successfully in {vite_dir_path}")
-
-        # For backward compatibility and direct calling
-
-    def _vite_install(self):
-        """Install Vite dependencies"""
-        vite_dir = current_app.config.get("INERTIA_VITE_DIR", "react")
-        vite_dir_path = os.path.join(current_app.root_path, vite_dir)
-        # Determine package manager
-        package_manager = get_package_manager(vite_dir_path)
-
-        # Run install
-        os.chdir(vite_dir_path)
-        subprocess.run([package_manager, "install"], check=True)
-        print(f"Vite dependencies installed successfully in {vite_dir_path}")
-
-    def _stream_output(self, process, prefix):
-        while True:
-            if process is not None:
-                output = process.stdout.readline()
-                if output:
-                    print(f"[{prefix}] {output.strip()}")
-                error = process.stderr.readline()
-                if error:
-                    print(f"[{prefix}] {error.strip()}", file=sys.stderr)
-                if process.poll() is not None:
-                    break
+            returncode = server.run()
+        finally:
+            # INERTIA_VITE_DEV = "auto" switches back to built assets
+            for hot_file in hot_files:
+                if os.path.exists(hot_file):
+                    os.remove(hot_file)
+        if returncode:
+            raise click.exceptions.Exit(returncode)
+
+    def _frontends(self):
+        """Yield ``(name, vite_dir_path, prefix)`` for the app and blueprint frontends"""
+        config = current_app.config
+        keys = ["INERTIA_VITE_DIR"] + sorted(
+            key for key in config if key.endswith("_INERTIA_VITE_DIR")
+        )
+        seen = set()
+        for key in keys:
+            prefix = key[: -len("INERTIA_VITE_DIR")]
+            vite_dir_path = os.path.join(current_app.root_path, config[key])
+            if vite_dir_path in seen:
+                continue
+            seen.add(vite_dir_path)
+            yield prefix.rstrip("_").lower() or "app", vite_dir_path, prefix
+
+    def _build_fingerprint_path(self, vite_dir_path, prefix=""):
+        """The build fingerprint is kept next to the manifest it produced"""
+        manifest_path = current_app.config.get(f"{prefix}INERTIA_VITE_MANIFEST_PATH")
+        if manifest_path is None:
+            return os.path.join(vite_dir_path, BUILD_FINGERPRINT)
+        return os.path.join(
+            current_app.root_path, os.path.dirname(manifest_path), BUILD_FINGERPRINT
+        )
+
+    def _run_jobs(self, jobs, action, max_workers=None):
+        """Run ``(name, args, cwd, fingerprint)`` jobs in parallel and summarize them"""
+        if not jobs:
+            return
+        results = run_parallel(
+            [(name, args, cwd) for name, args, cwd, _ in jobs], max_workers
+        )
+        failed = []
+        for name, _, cwd, (fingerprint_path, current) in jobs:
+            returncode = results[name]
+            if returncode == 0:
+                write_fingerprint(fingerprint_path, current)
+                print(f"[{name}] {action} succeeded in {cwd}")
+            elif returncode is None:
+                print(f"[{name}] {action} skipped")
             else:
-                break
-
-    def vite_build(self):
+                failed.append(name)
+                print(f"[{name}] {action} failed with exit code {returncode}")
+        if failed:
+            raise click.ClickException(f"Vite {action} failed for {', '.join(failed)}")
+
+    def _assets_dir(self, prefix=""):
+        """The build output directory of a frontend, from its config"""
+        config = current_app.config
+        assets_dir = config.get(f"{prefix}INERTIA_ASSETS_DIR")
+        if assets_dir is not None:
+            return os.path.join(current_app.root_path, assets_dir)
+        manifest_path = config.get(f"{prefix}INERTIA_VITE_MANIFEST_PATH")
+        if manifest_path is None:
+            return None
+        # Vite 5 writes the manifest to <outDir>/.vite/manifest.json
+        manifest_dir = os.path.dirname(
+            os.path.join(current_app.root_path, manifest_path)
+        )
+        if os.path.basename(manifest_dir) == ".vite":
+            manifest_dir = os.path.dirname(manifest_dir)
+        return manifest_dir
+
+    def _compress(self):
+        """Precompress the build output of every frontend"""
+        for name, _, prefix in self._frontends():
+            assets_dir = self._assets_dir(prefix)
+            if assets_dir is None or not os.path.isdir(assets_dir):
+                print(f"[{name}] No build output to compress")
+                continue
+            written = compress_assets(assets_dir)
+            print(f"[{name}] Compressed {written} file(s) in {assets_dir}")
+
+    def _vite_build(self, force=False, jobs=None, compress=False):
+        """Build Vite assets for production, for every frontend in parallel"""
+        builds = []
+        for name, vite_dir_path, prefix in self._frontends():
+            # Skip the build if the sources match the last successful build
+            fingerprint_path = self._build_fingerprint_path(vite_dir_path, prefix)
+            manifest_path = current_app.config.get(
+                f"{prefix}INERTIA_VITE_MANIFEST_PATH"
+            )
+            # The build writes its output, manifest and fingerprint there
+            exclude = [os.path.dirname(fingerprint_path)]
+            assets_dir = self._assets_dir(prefix)
+            if assets_dir is not None:
+                exclude.append(assets_dir)
+            current = fingerprint(vite_dir_path, exclude=exclude)
+            if (
+                not force
+                and read_fingerprint(fingerprint_path) == current
+                and (
+                    manifest_path is None
+                    or os.path.exists(
+                        os.path.join(current_app.root_path, manifest_path)
+                    )
+                )
+            ):
+                print(f"[{name}] Vite assets are up to date, skipping build")
+                continue
+
+            package_manager = get_package_manager(vite_dir_path)
+            builds.append(
+                (
+                    name,
+                    [package_manager, "run", "build"],
+                    vite_dir_path,
+                    (fingerprint_path, current),
+                )
+            )
+        self._run_jobs(builds, "build", jobs)
+        if compress:
+            self._compress()
+
+    def _vite_install(self, force=False, jobs=None):
+        """Install Vite dependencies, for every frontend in parallel"""
+        installs = []
+        for name, vite_dir_path, _ in self._frontends():
+            # Kept in node_modules so deleting it always forces a fresh install
+            fingerprint_path = os.path.join(
+                vite_dir_path, "node_modules", INSTALL_FINGERPRINT
+            )
+            current = fingerprint(vite_dir_path, files=DEPENDENCY_FILES)
+            if not force and read_fingerprint(fingerprint_path) == current:
+                print(f"[{name}] Vite dependencies are up to date, skipping install")
+                continue
+
+            package_manager = get_package_manager(vite_dir_path)
+            installs.append(
+                (
+                    name,
+                    [package_manager, "install"],
+                    vite_dir_path,
+                    (fingerprint_path, current),
+                )
+            )
+        self._run_jobs(installs, "install", jobs)
+
+    def _warmup(self):
+        """Warm up the Inertia extension"""
+        summary = self.inertia.warmup()
+        for template_name in summary["templates"]:
+            print(f"Compiled template {template_name}")
+        for blueprint, version in summary["versions"].items():
+            print(f"Asset version for {blueprint or 'app'}: {version}")
+        print(f"Vite manifest loaded: {summary['manifest']}")
+        if summary["ssr"] is not None:
+            print(f"SSR server reachable: {summary['ssr']}")
+        if summary["artifacts"] is not None:
+            print(f"Shared artifacts written to {summary['artifacts']}")
+
+    def _routes(self):
+        """Print the Inertia route registry"""
+        routes = sorted(
+            self.inertia.routes().values(), key=lambda route: route.rules or ("",)
+        )
+        if not routes:
+            print("No Inertia routes registered")
+            return
+        rows = [("Rule", "Endpoint", "Component", "Template", "Options")]
+        for route in routes:
+            options = [
+                name
+                for name, enabled in (
+                    ("encrypt", route.encrypt),
+                    ("clear", route.clear),
+                    (
+                        "stream",
+                        current_app.config["INERTIA_STREAM_JSON"]
+                        if route.stream is None
+                        else route.stream,
+                    ),
+                    ("prerender", route.prerender),
+                    ("ssr", self.inertia.ssr_enabled()),
+                )
+                if enabled
+            ]
+            rows.append(
+                (
+                    ", ".join(route.rules),
+                    route.endpoint,
+                    route.component,
+                    str(route.template),
+                    ", ".join(options),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        for row in rows:
+            print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+    def _prerender(self):
+        """Prerender static Inertia pages"""
+        manifest = self.inertia.prerender()
+        for url in manifest:
+            print(f"Prerendered {url}")
+        print(f"Prerendered {len(manifest)} page(s) in {self.inertia.prerender_dir()}")
+
+    def _ssr(self, workers=None):
+        """Run one SSR server per configured worker, restarting crashed ones"""
+        vite_dir = current_app.config.get("INERTIA_VITE_DIR")
+        vite_dir_path = os.path.join(current_app.root_path, vite_dir)
+        bundle = os.path.join(vite_dir_path, current_app.config["INERTIA_SSR_BUNDLE"])
+        if not os.path.exists(bundle):
+            raise click.ClickException(
+                f"No SSR bundle found at {bundle}. Run `flask vite build`."
+            )
+
+        workers = workers or current_app.config["INERTIA_SSR_WORKERS"]
+        supervisor = Supervisor()
+        for index, url in enumerate(
+            ssr_urls(current_app.config["INERTIA_SSR_URL"], workers)
+        ):
+            port = str(urlsplit(url).port)
+            supervisor.add(
+                f"ssr-{index}",
+                ["node", bundle, "--port", port],
+                cwd=vite_dir_path,
+                env={**os.environ, "INERTIA_SSR_PORT": port},
+            )
+            print(f"Starting SSR worker {index} on {url}")
+        supervisor.run()
+
+    def vite_build(self, force=False, jobs=None, compress=False):
         """Build Vite assets for production (for direct calling)"""
-        return self._vite_build()
+        return self._vite_build(force=force, jobs=jobs, compress=compress)
 
     def vite_dev(self):
         """Run Flask and Vite dev servers together (for direct calling)"""
         return self._vite_dev()
 
-    def vite_install(self):
+    def vite_install(self, force=False, jobs=None):
         """Install Vite dependencies (for direct calling)"""
-        return self._vite_install()
+        return self._vite_install(force=force, jobs=jobs)
 
     def get_package_manager(self, vite_dir_path=None):
         """Get the package manager used for the cli. Used for testing purposes."""
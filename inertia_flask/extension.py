@@ -1,19 +1,48 @@
 """The flask inertia extension"""
 
-import json
 import os
+import warnings
+import weakref
 from typing import Optional, Union
 
 
 from flask import Blueprint, Flask, current_app, request, session, url_for
 from flask.app import App
 from flask.blueprints import BlueprintSetupState
+from jinja2.exceptions import TemplateNotFound
 from werkzeug.wrappers import Response
 
-from .cli import InertiaCommands
-from .responses import encrypt_history, render
+from .artifacts import SharedArtifacts
+from .assets import is_hashed, send_asset
+from .cache import PropCache
+from .flash import INERTIA_SESSION_FLASH, flash, persist_flash
+from .headers import inertia_headers
+from .helpers import has_session
+from .lazy_cli import LazyGroup
+from .prerender import PRERENDER_ENVIRON_KEY, PrerenderedPages, prerender_pages
+from .responses import (
+    INERTIA_SESSION_CLEAR_HISTORY,
+    encrypt_history,
+    persist_history,
+    render,
+)
+from .routes import (
+    INERTIA_SSR_TEMPLATE,
+    build_route_registry,
+    make_route,
+    mark_inertia_view,
+)
 from .settings import init_settings
-from .version import get_asset_version
+from .ssr import SSRClient, ssr_urls
+from .version import compute_asset_version, get_asset_version
+from .vite import (
+    VITE_HOT_FILE,
+    ViteDevProbe,
+    ViteManifest,
+    component_keys,
+    manifest_chunks,
+    manifest_files,
+)
 
 
 class InertiaInitializationError(Exception):
@@ -22,6 +51,22 @@ class InertiaInitializationError(Exception):
     pass
 
 
+class InertiaState:
+    """Values computed for one app and reused across its requests"""
+
+    def __init__(self):
+        self.prerendered = PrerenderedPages()
+        self.manifest = ViteManifest()
+        self.ssr_manifest = ViteManifest()
+        self.vite_probe = ViteDevProbe()
+        self.preloads = (None, None, {})
+        self.hashed_assets = (None, None)
+        self.artifacts = SharedArtifacts()
+        self.prop_cache = None
+        self.asset_versions = {}
+        self.routes = None
+
+
 class Inertia:
     """
     Flask Inertia is an extension on Flask that enables the Inertia.js protocol.
@@ -30,6 +75,9 @@ class Inertia:
     app = current_app
 
     def __init__(self, app: Optional[Union[Flask, Blueprint]] = None):
+        # One extension may be initialized on several apps (app factories)
+        self._states = weakref.WeakKeyDictionary()
+        self.ssr = SSRClient()
         if app is not None:
             self.init_app(app)
 
@@ -39,13 +87,13 @@ class Inertia:
         self.encrypt = encrypt
         self._share_data = {}
         if isinstance(app, Flask):
-            cli = InertiaCommands(self)
             init_settings(app)  # Replace app.config.from_object(Settings)
             self._init_extension(app)
-            cli.register_as_flask(app)
+            self.register_commands(app.cli)
             app.context_processor(self.vite_processor)
             app.before_request(self.before_request)
             app.after_request(self.after_request)
+            self.register_assets(app)
         elif isinstance(app, Blueprint):
             blueprint = app
             # Register the extension once the blueprint is registered
@@ -59,9 +107,73 @@ class Inertia:
     def register_blueprint(self, state: BlueprintSetupState):
         """Register a blueprint with the app"""
         init_settings(state.app)  # Replace state.app.config.from_object(Settings)
-        cli = InertiaCommands(self)
         self._init_extension(state.app)
-        cli.register_as_blueprint(state.blueprint)
+        self.register_commands(state.blueprint.cli)
+
+    def register_commands(self, cli):
+        """Register the ``vite`` and ``inertia`` commands, loaded on first use."""
+
+        def commands():
+            from .cli import InertiaCommands
+
+            return InertiaCommands(self)
+
+        cli.add_command(
+            LazyGroup(
+                "vite",
+                lambda: commands().register_vite(),
+                help="Vite integration commands",
+            )
+        )
+        cli.add_command(
+            LazyGroup(
+                "inertia",
+                lambda: commands().register_inertia(),
+                help="Build Inertia assets for production",
+            )
+        )
+
+    def register_assets(self, app: Flask):
+        """Serve the Vite build output under ``INERTIA_ASSETS_URL``, when set."""
+        assets_url = app.config["INERTIA_ASSETS_URL"]
+        if assets_url is None:
+            return
+        app.add_url_rule(
+            f"{assets_url.rstrip('/')}/<path:filename>",
+            endpoint="inertia_assets",
+            view_func=self.serve_asset,
+        )
+
+    def assets_dir(self):
+        """Absolute path of the directory served by ``serve_asset``"""
+        assets_dir = current_app.config["INERTIA_ASSETS_DIR"]
+        if assets_dir is None:
+            return current_app.static_folder
+        return os.path.join(current_app.root_path, assets_dir)
+
+    def hashed_assets(self):
+        """Files of the Vite manifest, or ``None`` if there is none"""
+        if current_app.config.get("INERTIA_VITE_MANIFEST_PATH") is None:
+            return None
+        try:
+            manifest = self.get_manifest()
+        except OSError:
+            return None
+        state = self.state()
+        cached_manifest, files = state.hashed_assets
+        if cached_manifest is not manifest:
+            files = manifest_files(manifest)
+            state.hashed_assets = (manifest, files)
+        return files
+
+    def serve_asset(self, filename):
+        """Send a built asset, cached forever when the build hashed its name"""
+        return send_asset(
+            self.assets_dir(),
+            filename,
+            request.accept_encodings,
+            hashed=is_hashed(filename, self.hashed_assets()),
+        )
 
     def _init_extension(self, app: App):
         """Store a reference to the extension in the app's extensions."""
@@ -73,21 +185,173 @@ class Inertia:
             )
         else:
             app.extensions["inertia"] = self
+            self._states[app] = InertiaState()
+
+    def state(self, app: Optional[Flask] = None) -> InertiaState:
+        """Return the computed state of ``app``, the current app by default."""
+        return self._states[app or current_app._get_current_object()]
+
+    def routes(self):
+        """Return the Inertia route registry of the current app, building it once.
+
+        Flask does not allow adding routes once requests are handled, so the
+        registry built on the first request (or by ``warmup``) stays valid.
+        """
+        state = self.state()
+        if state.routes is None:
+            state.routes = build_route_registry(current_app._get_current_object())
+        return state.routes
+
+    def get_route(
+        self,
+        endpoint,
+        component,
+        encrypt=None,
+        clear=False,
+        stream=None,
+        prerender=False,
+    ):
+        """Return the registry record for ``endpoint`` rendering ``component``.
+
+        Views rendering a component other than the one their endpoint was
+        registered with (e.g. ``render`` calls) get a record resolved on the fly.
+        """
+        route = self.routes().get(endpoint)
+        if route is None or route.component != component:
+            route = make_route(
+                current_app, endpoint, component, encrypt, clear, stream, prerender
+            )
+        return route
+
+    def warmup(self, app: Optional[Flask] = None):
+        """Precompute everything the first requests would otherwise pay for.
+
+        Builds the route registry, compiles the layout templates, computes the
+        asset versions, loads the Vite manifest and connects to the SSR server. Pre-fork servers can call
+        this in the master process so every worker inherits the results.
+        When ``INERTIA_CACHE_FILE`` is set, the versions and manifest are also
+        written there for workers started from other processes.
+        """
+        app = app or current_app._get_current_object()
+        summary = {
+            "templates": [],
+            "versions": {},
+            "routes": 0,
+            "manifest": False,
+            "ssr": None,
+            "artifacts": None,
+        }
+        state = self.state(app)
+        with app.app_context(), state.artifacts.rebuilding():
+            state.routes = None
+            summary["routes"] = len(self.routes())
+
+            template_names = [
+                value
+                for key, value in app.config.items()
+                if key == "INERTIA_TEMPLATE" or key.endswith("_INERTIA_TEMPLATE")
+            ]
+            if app.config["INERTIA_SSR_ENABLED"]:
+                template_names.append(
+                    app.config.get("INERTIA_SSR_TEMPLATE", INERTIA_SSR_TEMPLATE)
+                )
+            for template_name in template_names:
+                try:
+                    app.jinja_env.get_template(template_name)
+                    summary["templates"].append(template_name)
+                except TemplateNotFound:
+                    app.logger.warning(f"Template not found: {template_name}")
+
+            for blueprint in [None, *app.blueprints]:
+                version = compute_asset_version(blueprint)
+                state.asset_versions[blueprint] = version
+                summary["versions"][blueprint] = version
+
+            manifests = {}
+            manifest_path = app.config.get("INERTIA_VITE_MANIFEST_PATH")
+            if manifest_path is not None:
+                try:
+                    manifests[manifest_path] = self.get_manifest()
+                    summary["manifest"] = True
+                except OSError:
+                    app.logger.warning("Vite manifest not found. Run `npm run build`.")
+
+            if app.config["INERTIA_SSR_ENABLED"]:
+                summary["ssr"] = self.ssr.warmup(self.ssr_urls())
+
+            artifacts_path = self.artifacts_path()
+            if artifacts_path is not None:
+                state.artifacts.write(artifacts_path, summary["versions"], manifests)
+                summary["artifacts"] = artifacts_path
+
+        return summary
+
+    def artifacts_path(self):
+        """Absolute path of the shared artifact file, ``None`` when disabled."""
+        cache_file = current_app.config["INERTIA_CACHE_FILE"]
+        if cache_file is None:
+            return None
+        return os.path.join(current_app.root_path, cache_file)
+
+    def prop_cache(self):
+        """Return the cache of ``cached`` props, on ``INERTIA_CACHE_BACKEND``."""
+        state = self.state()
+        if state.prop_cache is None:
+            state.prop_cache = PropCache(current_app.config["INERTIA_CACHE_BACKEND"])
+        return state.prop_cache
+
+    def get_shared_version(self, blueprint):
+        """Return the asset version stored in the shared artifact file, if any."""
+        artifacts_path = self.artifacts_path()
+        if artifacts_path is None:
+            return None
+        return self.state().artifacts.get_version(
+            artifacts_path, blueprint, current_app.root_path
+        )
+
+    def get_manifest(self):
+        """Return the parsed Vite manifest of the current app."""
+        manifest_path = current_app.config.get("INERTIA_VITE_MANIFEST_PATH")
+        if manifest_path is None:
+            raise ValueError(
+                "Manifest path is not set. Set INERTIA_VITE_MANIFEST_PATH in your config."
+            )
+        source = os.path.join(current_app.root_path, manifest_path)
+        artifacts_path = self.artifacts_path()
+        if artifacts_path is not None:
+            manifest = self.state().artifacts.get_manifest(
+                artifacts_path, manifest_path, current_app.root_path
+            )
+            if manifest is not None:
+                return manifest
+        return self.state().manifest.load(source)
 
     def before_request(self):
         """Before middleware"""
         if self.encrypt:
             encrypt_history(self.encrypt)
 
+        # Answer stale GET visits before the view does any work
+        if self.is_inertia_request() and self.is_stale_inertia_get():
+            return self.force_refresh()
+
+        if current_app.config["INERTIA_PRERENDER_SERVE"]:
+            return self.serve_prerendered()
+
     def after_request(self, response):
         """After middleware"""
+        # Only write to the session what this response did not already render
+        persist_history()
+        persist_flash()
+
         if not self.is_inertia_request():
             return response
 
         if self.is_non_post_redirect(response):
             response.status_code = 303
 
-        if self.is_stale():
+        # GET requests were already checked in before_request
+        if request.method != "GET" and self.is_stale():
             return self.force_refresh()
 
         return response
@@ -102,7 +366,7 @@ class Inertia:
 
     def is_inertia_request(self):
         "Check that the request has the X-Inertia header"
-        return "X-Inertia" in request.headers
+        return inertia_headers().inertia
 
     def is_redirect_request(self, response):
         "If we are redirecting, update the status code"
@@ -110,11 +374,10 @@ class Inertia:
 
     def is_stale(self):
         "Will return true if the html document does not match what the client has."
-        blueprint = request.blueprint or None
-        return request.headers.get(
-            "X-Inertia-Version",
-            get_asset_version(blueprint),
-        ) != get_asset_version(blueprint)
+        client_version = inertia_headers().version
+        return client_version is not None and client_version != get_asset_version(
+            request.blueprint or None
+        )
 
     def is_stale_inertia_get(self):
         "Check that the request is GET and stale html document"
@@ -122,13 +385,53 @@ class Inertia:
 
     def force_refresh(self):
         "Force the client to refresh the html document"
-        # Store flash messages for the next request
-        if "messages" in session:
-            session["_messages"] = session["messages"]
-            del session["messages"]
-
+        # Pending flash messages are kept for the next request by after_request
         return Response("", status=409, headers={"X-Inertia-Location": request.url})
 
+    def prerender_dir(self):
+        """Absolute path of the directory holding prerendered pages"""
+        return os.path.join(
+            current_app.root_path, current_app.config["INERTIA_PRERENDER_DIR"]
+        )
+
+    def prerender(self):
+        """Render all prerenderable routes of the current app to static files."""
+        if self._share_data:
+            current_app.logger.warning(
+                "Shared data is request specific and cannot be prerendered. "
+                "Skipping prerendering."
+            )
+            return {}
+        return prerender_pages(current_app, self.prerender_dir())
+
+    def serve_prerendered(self):
+        "Return the prerendered response for this request, if there is one"
+        if (
+            request.method != "GET"
+            or request.query_string
+            or PRERENDER_ENVIRON_KEY in request.environ
+            or inertia_headers().partial
+            or inertia_headers().reset
+            or inertia_headers().except_once
+            or (
+                has_session()
+                and (
+                    INERTIA_SESSION_CLEAR_HISTORY in session
+                    or INERTIA_SESSION_FLASH in session
+                )
+            )
+        ):
+            return None
+
+        version = get_asset_version(request.blueprint or None)
+        client_version = inertia_headers().version
+        if client_version is not None and client_version != version:
+            return None
+
+        return self.state().prerendered.response(
+            self.prerender_dir(), request.path, version, self.is_inertia_request()
+        )
+
     def add_shorthand_route(
         self,
         app: Flask | Blueprint,
@@ -136,6 +439,7 @@ class Inertia:
         component_name: str,
         endpoint: Optional[str] = None,
         encrypt=None,
+        prerender=True,
     ) -> None:
         """Connect a URL rule to a frontend component that does not need a controller.
 
@@ -146,6 +450,7 @@ class Inertia:
         :param component_name: Your frontend component name
         :param endpoint: The endpoint for the registered URL rule. (by default
         ``component_name`` in lower case)
+        :param prerender: Include the route in ``flask inertia prerender``
         """
         if not app:
             raise RuntimeError("Extension has not been initialized correctly.")
@@ -155,16 +460,132 @@ class Inertia:
                 encrypt_history(encrypt)
             return render(request, component_name)
 
-        app.add_url_rule(
-            url,
-            endpoint or component_name.lower(),
-            lambda: route_render(component_name),
-        )
+        def view():
+            return route_render(component_name)
+
+        mark_inertia_view(view, component_name, encrypt=encrypt, prerender=prerender)
+
+        app.add_url_rule(url, endpoint or component_name.lower(), view)
 
     def share(self, key, value):
         """Share data with all requests."""
         self._share_data[key] = value
 
+    def ssr_enabled(self):
+        """Whether first loads are rendered by the SSR server, never in debug mode"""
+        config = current_app.config
+        return config["INERTIA_SSR_ENABLED"] and config["DEBUG"] is False
+
+    def ssr_urls(self):
+        """URLs of the configured SSR servers"""
+        config = current_app.config
+        return ssr_urls(config["INERTIA_SSR_URL"], config["INERTIA_SSR_WORKERS"])
+
+    def vite_dev_origin(self):
+        """Origin of the running Vite dev server, from its hot file or config"""
+        config = current_app.config
+        return self.state().vite_probe.origin(
+            os.path.join(
+                current_app.root_path, config["INERTIA_VITE_DIR"], VITE_HOT_FILE
+            ),
+            config.get("INERTIA_VITE_ORIGIN", "http://localhost:5173"),
+            ttl=config["INERTIA_VITE_PROBE_TTL"],
+        )
+
+    def vite_dev_running(self):
+        """Whether the Vite dev server is up"""
+        return self.vite_dev_origin() is not None
+
+    def get_ssr_manifest(self):
+        """Return the parsed Vite SSR manifest, or ``None`` if there is none."""
+        manifest_path = current_app.config.get("INERTIA_VITE_SSR_MANIFEST_PATH")
+        if manifest_path is None:
+            return None
+        try:
+            return self.state().ssr_manifest.load(
+                os.path.join(current_app.root_path, manifest_path)
+            )
+        except OSError:
+            return None
+
+    def vite_dev_server_running(self):
+        """Whether assets should come from the Vite dev server"""
+        is_debug = current_app.config.get("DEBUG", False) is True
+
+        # INERTIA_VITE_DEV takes precedence; falls back to DEBUG
+        vite_dev_setting = current_app.config.get("INERTIA_VITE_DEV")
+        if vite_dev_setting == "auto":
+            return is_debug and self.vite_dev_running()
+        elif vite_dev_setting is not None:
+            return bool(vite_dev_setting)
+        return is_debug
+
+    def preload_urls(self, component=None):
+        """URLs of the JS and CSS to preload for ``component``, or for the entry.
+
+        A page component is looked up in the client manifest, falling back to
+        the SSR manifest when it is not a chunk of its own there. The manifest
+        files are cached per component until the manifests change, and their
+        URLs built per request. Empty while the Vite dev server is used.
+        """
+        config = current_app.config
+        if config.get("INERTIA_VITE_MANIFEST_PATH") is None or (
+            config.get("DEBUG") is True and self.vite_dev_server_running()
+        ):
+            return []
+        try:
+            manifest = self.get_manifest()
+        except OSError:
+            return []
+        ssr_manifest = self.get_ssr_manifest()
+
+        state = self.state()
+        cached_manifest, cached_ssr_manifest, preloads = state.preloads
+        if cached_manifest is not manifest or cached_ssr_manifest is not ssr_manifest:
+            preloads = {}
+            state.preloads = (manifest, ssr_manifest, preloads)
+        entry = config["INERTIA_VITE_ENTRY"]
+        key = (component, entry)
+        if key not in preloads:
+            preloads[key] = self._resolve_preloads(
+                manifest, ssr_manifest, component, entry
+            )
+        filenames, urls = preloads[key]
+        # Depends on the request's SCRIPT_NAME and blueprint
+        static_endpoint = config.get("INERTIA_STATIC_ENDPOINT", "static")
+        return [
+            url_for(static_endpoint, filename=filename) for filename in filenames
+        ] + urls
+
+    def _resolve_preloads(self, manifest, ssr_manifest, component, entry=None):
+        """Return the manifest files, and the SSR manifest URLs, to preload"""
+        if component is None:
+            if entry is None:
+                # Unambiguous only when the build has a single entry
+                entries = [
+                    key for key, chunk in manifest.items() if chunk.get("isEntry")
+                ]
+                entry = entries[0] if len(entries) == 1 else None
+            keys = [entry] if entry is not None else []
+        else:
+            candidates = component_keys(
+                current_app.config["INERTIA_VITE_PAGES_DIR"], component
+            )
+            keys = [key for key in candidates if key in manifest][:1]
+            if not keys:
+                # The SSR manifest lists client URLs for every source module
+                for key in candidates:
+                    if ssr_manifest and key in ssr_manifest:
+                        return [], [
+                            url
+                            for url in ssr_manifest[key]
+                            if url.endswith((".js", ".css"))
+                        ]
+                return [], []
+
+        scripts, styles = manifest_chunks(manifest, keys)
+        return styles + scripts, []
+
     def vite_processor(self):
         "Attach Vite templates to the jinja2 templating language for flask"
         flask_debug = current_app.config.get("DEBUG", False)
@@ -173,52 +594,29 @@ class Inertia:
         )
         is_debug = flask_debug is True
 
-        # INERTIA_VITE_DEV takes precedence; falls back to DEBUG
-        vite_dev_setting = current_app.config.get("INERTIA_VITE_DEV")
-        if vite_dev_setting is not None:
-            vite_dev_server_running = bool(vite_dev_setting)
-        else:
-            vite_dev_server_running = is_debug
+        vite_dev_server_running = self.vite_dev_server_running()
+        if (
+            is_debug
+            and vite_dev_server_running
+            and current_app.config.get("INERTIA_VITE_DEV") == "auto"
+        ):
+            # Vite moves to another port when the configured one is taken
+            vite_origin = self.vite_dev_origin() or vite_origin
 
         def dev_asset(file_path, _=None):
             return f"{vite_origin}/{file_path}"
 
         def prod_asset(file_path, manifest_path=None):
-            manifest = {}
             static_endpoint = current_app.config.get(
                 "INERTIA_STATIC_ENDPOINT", "static"
             )
-            manifest_path = os.path.join(
-                current_app.root_path,
-                current_app.config.get("INERTIA_VITE_MANIFEST_PATH"),
-            )
-            if manifest_path is None:
-                raise ValueError(
-                    "Manifest path is not set. Set INERTIA_VITE_MANIFEST_PATH in your config."
-                )
-
             try:
-                with open(
-                    os.path.join(current_app.root_path, manifest_path), encoding="utf-8"
-                ) as content:
-                    manifest = json.load(content)
-                    if file_path in manifest:
-                        url_path = manifest[file_path]["file"]
-                        return url_for(
-                            static_endpoint,
-                            filename=url_path,
-                        )
-                    else:
-                        current_app.logger.warning(
-                            f"Asset {file_path} not found in manifest"
-                        )
-                        return url_for(
-                            static_endpoint,
-                            filename=file_path,
-                        )
+                manifest = self.get_manifest()
             except OSError as exception:
                 current_app.logger.error(
-                    f"Manifest file not found at {manifest_path}. Run `npm run build`."
+                    "Manifest file not found at "
+                    f"{current_app.config.get('INERTIA_VITE_MANIFEST_PATH')}. "
+                    "Run `npm run build`."
                 )
                 # Fallback to direct path in development
                 if is_debug:
@@ -230,6 +628,19 @@ class Inertia:
                     "Manifest file not found. Run `npm run build`."
                 ) from exception
 
+            if file_path in manifest:
+                url_path = manifest[file_path]["file"]
+                return url_for(
+                    static_endpoint,
+                    filename=url_path,
+                )
+            else:
+                current_app.logger.warning(f"Asset {file_path} not found in manifest")
+                return url_for(
+                    static_endpoint,
+                    filename=file_path,
+                )
+
         def vite_react_refresh():
             return f"""
                 <script type="module">
@@ -259,18 +670,9 @@ class Inertia:
                 # Use production assets even in debug mode if Vite server isn't running
                 css_files = []
                 try:
-                    manifest_path = current_app.config.get("INERTIA_VITE_MANIFEST_PATH")
-                    if manifest_path is None:
-                        raise ValueError(
-                            "Manifest path is not set. Set INERTIA_VITE_MANIFEST_PATH in your config."
-                        )
-                    with open(
-                        os.path.join(current_app.root_path, manifest_path),
-                        encoding="utf-8",
-                    ) as content:
-                        manifest = json.load(content)
-                        if entry_file in manifest and "css" in manifest[entry_file]:
-                            css_files = manifest[entry_file]["css"]
+                    manifest = self.get_manifest()
+                    if entry_file in manifest and "css" in manifest[entry_file]:
+                        css_files = manifest[entry_file]["css"]
                 except FileNotFoundError:
                     pass
 
@@ -307,11 +709,13 @@ class Inertia:
         }
 
 
-# Example usage of flash messages helper
 def add_message(category, message):
     """
     Helper function to add flash messages that persist across Inertia requests
     """
-    if "messages" not in session:
-        session["messages"] = []
-    session["messages"].append({"category": category, "message": message})
+    warnings.warn(
+        "add_message is deprecated and will be removed in a future version. Please use flash instead.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    flash(message, category)
@@ -0,0 +1,94 @@
+"""Flash messages and validation errors shared with the next Inertia page"""
+
+from flask import request, session
+
+from .headers import inertia_headers
+from .helpers import has_session
+from .prop_classes import CallableProp
+
+INERTIA_REQUEST_FLASH = "_inertia_flash"
+INERTIA_SESSION_FLASH = "_inertia_flash"
+DEFAULT_ERROR_BAG = "default"
+
+
+def _pending():
+    """Return the flash state held on this request.
+
+    The state lives on the request while it is handled; ``persist_flash``
+    writes back only what the response did not render, in a single session key.
+    """
+    pending = getattr(request, INERTIA_REQUEST_FLASH, None)
+    if pending is None:
+        pending = {"flash": {}, "errors": {}}
+        setattr(request, INERTIA_REQUEST_FLASH, pending)
+    return pending
+
+
+def _load():
+    """Move the state stored in the session by a previous request to this one."""
+    pending = _pending()
+    if has_session() and INERTIA_SESSION_FLASH in session:
+        stored = session.pop(INERTIA_SESSION_FLASH)
+        for category, messages in stored.get("flash", {}).items():
+            pending["flash"][category] = messages + pending["flash"].get(category, [])
+        for bag, errors in stored.get("errors", {}).items():
+            pending["errors"][bag] = {**errors, **pending["errors"].get(bag, {})}
+    return pending
+
+
+def flash(message, category="message"):
+    """Flash ``message`` to the next rendered Inertia page."""
+    _pending()["flash"].setdefault(category, []).append(message)
+
+
+def with_errors(errors, bag=None):
+    """Share validation ``errors`` (field to message) with the next page.
+
+    :param bag: Error bag name, to separate the errors of several forms on a page
+    """
+    _pending()["errors"].setdefault(bag or DEFAULT_ERROR_BAG, {}).update(errors)
+
+
+def get_flash():
+    """Return and consume the pending flash messages, grouped by category."""
+    pending = _load()
+    messages, pending["flash"] = pending["flash"], {}
+    return messages
+
+
+def get_errors():
+    """Return and consume the pending errors for the requested error bag.
+
+    Like Laravel, the requested bag is used when it has errors, then the
+    default bag, then every bag. All bags are consumed, so validation errors
+    are shown by one page only.
+    """
+    pending = _load()
+    bags, pending["errors"] = pending["errors"], {}
+    bag = inertia_headers().error_bag
+    if bag and bag in bags:
+        return {bag: bags[bag]}
+    if DEFAULT_ERROR_BAG in bags:
+        return bags[DEFAULT_ERROR_BAG]
+    return bags
+
+
+def flash_props():
+    """Props injecting pending flash messages and errors, when there are any."""
+    pending = _load()
+    props = {}
+    if pending["flash"]:
+        props["flash"] = CallableProp(get_flash)
+    if pending["errors"]:
+        props["errors"] = CallableProp(get_errors)
+    return props
+
+
+def persist_flash():
+    """Keep flash messages and errors that were not rendered for the next request."""
+    pending = getattr(request, INERTIA_REQUEST_FLASH, None)
+    if pending is None:
+        return
+    stored = {key: value for key, value in pending.items() if value}
+    if stored:
+        session[INERTIA_SESSION_FLASH] = stored
@@ -0,0 +1,62 @@
+"""The Inertia request headers, parsed once per request"""
+
+from typing import NamedTuple, Optional
+
+from flask import request
+
+INERTIA_REQUEST_HEADERS = "_inertia_headers"
+
+
+def split_header(value):
+    return frozenset(value.split(",")) if value else frozenset()
+
+
+class InertiaHeaders(NamedTuple):
+    """Immutable snapshot of the Inertia protocol headers of a request"""
+
+    inertia: bool
+    version: Optional[str]
+    partial: bool
+    partial_component: Optional[str]
+    partial_data: frozenset
+    partial_except: frozenset
+    reset: frozenset
+    except_once: frozenset
+    error_bag: Optional[str]
+    merge_intent: Optional[str]
+
+    @classmethod
+    def parse(cls, headers):
+        return cls(
+            inertia="X-Inertia" in headers,
+            version=headers.get("X-Inertia-Version"),
+            partial=(
+                "X-Inertia-Partial-Data" in headers
+                or "X-Inertia-Partial-Except" in headers
+            ),
+            partial_component=headers.get("X-Inertia-Partial-Component"),
+            partial_data=split_header(headers.get("X-Inertia-Partial-Data")),
+            partial_except=split_header(headers.get("X-Inertia-Partial-Except")),
+            reset=split_header(headers.get("X-Inertia-Reset")),
+            except_once=split_header(headers.get("X-Inertia-Except-Once-Props")),
+            error_bag=headers.get("X-Inertia-Error-Bag") or None,
+            merge_intent=headers.get("X-Inertia-Infinite-Scroll-Merge-Intent"),
+        )
+
+    def is_partial_render(self, component):
+        return self.partial and self.partial_component == component
+
+    def is_partial_key(self, key):
+        if self.partial_except:
+            return key not in self.partial_except
+        return key in self.partial_data
+
+
+def inertia_headers(flask_request=None):
+    """Return the :class:`InertiaHeaders` of the request, parsed on first use."""
+    flask_request = flask_request or request
+    headers = getattr(flask_request, INERTIA_REQUEST_HEADERS, None)
+    if headers is None:
+        headers = InertiaHeaders.parse(flask_request.headers)
+        setattr(flask_request, INERTIA_REQUEST_HEADERS, headers)
+    return headers
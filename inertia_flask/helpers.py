@@ -1,3 +1,12 @@
+import json
+import os
+import re
+from collections.abc import Iterator
+from itertools import islice
+
+from flask import current_app, request
+
+
 def deep_transform_callables(prop):
     if not isinstance(prop, dict):
         return prop() if callable(prop) else prop
@@ -15,3 +24,136 @@ def validate_type(value, name, expected_type):
         )
 
     return value
+
+
+def fetch_page(source, page, per_page, paginate=None):
+    """Fetch a single page of ``source`` without materializing the rest.
+
+    ``source`` may be a query object exposing ``offset``/``limit`` (e.g.
+    SQLAlchemy ``Query``), a sequence or any iterable, or a callable returning
+    one. ``paginate``, a callable taking ``(offset, limit)``, is used instead
+    when given. One extra row is requested to know whether a next page exists.
+    """
+    offset = (page - 1) * per_page
+    limit = per_page + 1
+    if paginate is not None:
+        rows = list(paginate(offset, limit))
+    else:
+        if callable(source):
+            source = source()
+        if hasattr(source, "offset") and hasattr(source, "limit"):
+            rows = list(source.offset(offset).limit(limit))
+        elif hasattr(source, "__getitem__") and hasattr(source, "__len__"):
+            rows = list(source[offset : offset + limit])
+        else:
+            rows = list(islice(source, offset, offset + limit))
+
+    return rows[:per_page], len(rows) > per_page
+
+
+class RawJSON:
+    """A JSON document written verbatim into the page, without parsing it"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __repr__(self):
+        return f"RawJSON({self.text!r})"
+
+
+def dumps_json(value, cls, **kwargs):
+    """Encode ``value`` with ``json.dumps``, splicing in :class:`RawJSON` values.
+
+    Raw values are encoded as placeholder strings, replaced by their text in
+    the output. Other values the encoder does not support are encoded as strings.
+    """
+    raw = []
+    token = None
+
+    def default(obj):
+        nonlocal token
+        if isinstance(obj, RawJSON):
+            if token is None:
+                token = os.urandom(8).hex()
+            raw.append(obj.text)
+            return f"{token}:{len(raw) - 1}"
+        return str(obj)
+
+    content = json.dumps(value, cls=cls, default=default, **kwargs)
+    if raw:
+        content = re.sub(
+            rf'"{token}:(\d+)"', lambda match: raw[int(match.group(1))], content
+        )
+    return content
+
+
+def iter_json(value, encoder):
+    """Encode ``value`` as JSON incrementally, yielding string fragments.
+
+    Iterators (generators, database cursors, ...) are written out as arrays one
+    item at a time so they never need to be materialized in memory.
+    """
+    if isinstance(value, RawJSON):
+        yield value.text
+    elif isinstance(value, dict):
+        yield "{"
+        first = True
+        for key, item in value.items():
+            if not first:
+                yield ","
+            first = False
+            if not isinstance(key, str):
+                key = encoder.encode(key).strip('"')
+            yield encoder.encode(key)
+            yield ":"
+            yield from iter_json(item, encoder)
+        yield "}"
+    elif isinstance(value, (list, tuple, Iterator)):
+        yield "["
+        first = True
+        for item in value:
+            if not first:
+                yield ","
+            first = False
+            yield from iter_json(item, encoder)
+        yield "]"
+    else:
+        yield encoder.encode(value)
+
+
+def iter_json_chunks(value, encoder, chunk_size=65536):
+    """Group the fragments of :func:`iter_json` into chunks of ``chunk_size``."""
+    buffer = []
+    size = 0
+    for fragment in iter_json(value, encoder):
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def has_session():
+    """Whether the client sent a session cookie.
+
+    Any access to ``flask.session`` marks it as accessed (adding ``Vary: Cookie``)
+    and may load it from a server-side store, so read-only navigations check
+    for the cookie first.
+    """
+    interface = current_app.session_interface
+    return interface.get_cookie_name(current_app) in request.cookies
+
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` so readers only ever see a complete file."""
+    import tempfile
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
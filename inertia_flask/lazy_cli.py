@@ -0,0 +1,30 @@
+"""Click groups whose commands are only defined when the CLI is used"""
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Stands in for the group returned by ``load`` until it is invoked.
+
+    Registering the commands this way keeps ``inertia_flask.cli`` and the
+    process management it needs out of the import path of web workers.
+    """
+
+    def __init__(self, name, load, **kwargs):
+        super().__init__(name, **kwargs)
+        self._load = load
+        self._group = None
+
+    def load(self):
+        if self._group is None:
+            self._group = self._load()
+        return self._group
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+    def list_commands(self, ctx):
+        return self.load().list_commands(ctx)
+
+    def get_command(self, ctx, cmd_name):
+        return self.load().get_command(ctx, cmd_name)
@@ -0,0 +1,168 @@
+"""Build-time rendering of Inertia pages that need no per-request props"""
+
+import json
+import os
+import re
+
+from flask import Response
+
+from .helpers import write_atomic
+from .routes import INERTIA_ROUTE_ATTRIBUTE
+
+PRERENDER_ENVIRON_KEY = "inertia.prerender"
+PRERENDER_MANIFEST = "manifest.json"
+# <endpoint>.<version>.<html|json>, as named by prerender_pages
+PRERENDER_FILE = re.compile(r"^[\w-]+\.[^/\\]{1,12}\.(html|json)$")
+
+
+def prerender_routes(app):
+    """Yield ``(url, endpoint)`` for every GET route opted into prerendering."""
+    for rule in app.url_map.iter_rules():
+        view = app.view_functions.get(rule.endpoint)
+        if not getattr(view, INERTIA_ROUTE_ATTRIBUTE, {}).get("prerender"):
+            continue
+        if rule.arguments or "GET" not in rule.methods:
+            app.logger.warning(
+                f"Cannot prerender {rule.rule}: only static GET routes are supported."
+            )
+            continue
+        yield rule.rule, rule.endpoint
+
+
+def read_manifest(output_dir):
+    """Return the prerender manifest in ``output_dir``, empty if there is none."""
+    try:
+        with open(
+            os.path.join(output_dir, PRERENDER_MANIFEST), encoding="utf-8"
+        ) as content:
+            return json.load(content)
+    except (OSError, ValueError):
+        return {}
+
+
+def prerender_pages(app, output_dir):
+    """Render every opted-in route to HTML and JSON files in ``output_dir``.
+
+    Files are written atomically and the manifest is swapped in last, so a
+    running worker never reads a partial file. Files only listed by the
+    previous manifest are removed afterwards.
+
+    Prerendered pages are served to every visitor, so routes whose rendering
+    reads the session (e.g. CSRF tokens, flash messages or the current user)
+    are skipped.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    previous = read_manifest(output_dir)
+    client = app.test_client()
+    environ = {PRERENDER_ENVIRON_KEY: True}
+    manifest = {}
+
+    for url, endpoint in prerender_routes(app):
+        html = client.get(url, environ_overrides=environ)
+        page = client.get(url, headers={"X-Inertia": "true"}, environ_overrides=environ)
+        if html.status_code != 200 or page.status_code != 200:
+            app.logger.warning(
+                f"Cannot prerender {url}: got status {html.status_code}/{page.status_code}."
+            )
+            continue
+        if any(
+            "Cookie" in response.vary or "Set-Cookie" in response.headers
+            for response in (html, page)
+        ):
+            app.logger.warning(
+                f"Cannot prerender {url}: it depends on the session or cookies."
+            )
+            continue
+
+        version = page.get_json()["version"]
+        name = endpoint.replace(".", "_")
+        entry = {
+            "endpoint": endpoint,
+            "version": version,
+            "html": f"{name}.{version[:12]}.html",
+            "json": f"{name}.{version[:12]}.json",
+        }
+        write_atomic(os.path.join(output_dir, entry["html"]), html.data)
+        write_atomic(os.path.join(output_dir, entry["json"]), page.data)
+        manifest[url] = entry
+
+    write_atomic(
+        os.path.join(output_dir, PRERENDER_MANIFEST),
+        json.dumps(manifest, indent=2).encode("utf-8"),
+    )
+
+    # Remove the files of the previous build that the new manifest no longer uses
+    current = set()
+    for entry in manifest.values():
+        current.update((entry["html"], entry["json"]))
+    for entry in previous.values():
+        for filename in (entry.get("html"), entry.get("json")):
+            if (
+                filename
+                and filename not in current
+                and os.path.basename(filename) == filename
+                and PRERENDER_FILE.match(filename)
+            ):
+                try:
+                    os.remove(os.path.join(output_dir, filename))
+                except OSError:
+                    pass
+
+    return manifest
+
+
+class PrerenderedPages:
+    """Loads the prerender manifest and serves its pages from memory.
+
+    The manifest is reloaded whenever it is replaced, so a new
+    ``flask inertia prerender`` run is picked up without restarting workers.
+    """
+
+    def __init__(self):
+        self._stamp = None
+        self._pages = {}
+
+    def load(self, output_dir):
+        manifest_path = os.path.join(output_dir, PRERENDER_MANIFEST)
+        try:
+            stat = os.stat(manifest_path)
+        except OSError:
+            self._stamp, self._pages = None, {}
+            return self._pages
+
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with open(manifest_path, encoding="utf-8") as content:
+                manifest = json.load(content)
+            pages = {}
+            try:
+                for url, entry in manifest.items():
+                    with open(os.path.join(output_dir, entry["html"]), "rb") as file:
+                        html = file.read()
+                    with open(os.path.join(output_dir, entry["json"]), "rb") as file:
+                        data = file.read()
+                    pages[url] = (entry["version"], html, data)
+            except OSError:
+                # Replaced by a new build meanwhile, keep serving what is loaded
+                return self._pages
+            self._stamp, self._pages = stamp, pages
+
+        return self._pages
+
+    def response(self, output_dir, path, version, is_inertia):
+        """Return the prerendered response for ``path`` or ``None``.
+
+        Pages built against another asset version are ignored.
+        """
+        page = self.load(output_dir).get(path)
+        if page is None or page[0] != version:
+            return None
+
+        _, html, data = page
+        if is_inertia:
+            return Response(
+                data,
+                headers={"Vary": "X-Inertia", "X-Inertia": "true"},
+                content_type="application/json",
+            )
+        return Response(html, content_type="text/html; charset=utf-8")
@@ -1,7 +1,27 @@
-from abc import ABC, abstractmethod
+import time
+from datetime import timedelta
+
+from flask import current_app, request
+
+from .headers import inertia_headers
+from .helpers import fetch_page
+
+# Type tags, so page building dispatches on one lookup instead of isinstance chains.
+# They are derived from the prop base classes once per type, see prop_flags.
+PROP_IGNORE_ON_FIRST_LOAD = 1
+PROP_DEFERRED = 2
+PROP_MERGEABLE = 4
+PROP_SCROLL = 8
+PROP_ONCE = 16
+
+MERGE_APPEND = "append"
+MERGE_PREPEND = "prepend"
+MERGE_DEEP = "deep"
 
 
 class CallableProp:
+    __slots__ = ("prop",)
+
     def __init__(self, prop):
         self.prop = prop
 
@@ -9,21 +29,31 @@ class CallableProp:
         return self.prop() if callable(self.prop) else self.prop
 
 
-class MergeableProp(ABC):
-    @abstractmethod
+class MergeableProp:
+    __slots__ = ()
+    match_on = ()
+
     def should_merge(self):
-        pass
+        return True
+
+    def merge_strategy(self):
+        return MERGE_APPEND
+
+    def merge_path(self, key):
+        return key
 
 
 class IgnoreOnFirstLoadProp:
-    pass
+    __slots__ = ()
 
 
 class OptionalProp(CallableProp, IgnoreOnFirstLoadProp):
-    pass
+    __slots__ = ()
 
 
 class DeferredProp(CallableProp, MergeableProp, IgnoreOnFirstLoadProp):
+    __slots__ = ("group", "merge")
+
     def __init__(self, prop, group, merge=False):
         super().__init__(prop)
         self.group = group
@@ -34,5 +64,129 @@ class DeferredProp(CallableProp, MergeableProp, IgnoreOnFirstLoadProp):
 
 
 class MergeProp(CallableProp, MergeableProp):
+    __slots__ = ("strategy", "match_on")
+
+    def __init__(self, prop, strategy=MERGE_APPEND, match_on=()):
+        super().__init__(prop)
+        if strategy not in (MERGE_APPEND, MERGE_PREPEND, MERGE_DEEP):
+            raise ValueError(f"Unknown merge strategy: {strategy}")
+        self.strategy = strategy
+        self.match_on = (match_on,) if isinstance(match_on, str) else tuple(match_on)
+
     def should_merge(self):
         return True
+
+    def merge_strategy(self):
+        return self.strategy
+
+
+class ScrollProp(MergeProp):
+    __slots__ = ("per_page", "page_name", "wrapper", "paginate")
+
+    def __init__(
+        self,
+        prop,
+        per_page=15,
+        page_name="page",
+        wrapper="data",
+        match_on=(),
+        paginate=None,
+    ):
+        super().__init__(prop, match_on=match_on)
+        self.per_page = per_page
+        self.page_name = page_name
+        self.wrapper = wrapper
+        self.paginate = paginate
+
+    def current_page(self):
+        try:
+            page = int(request.args.get(self.page_name, 1))
+        except ValueError:
+            page = 1
+        return max(page, 1)
+
+    def merge_strategy(self):
+        intent = inertia_headers().merge_intent
+        return MERGE_PREPEND if intent == MERGE_PREPEND else MERGE_APPEND
+
+    def merge_path(self, key):
+        return f"{key}.{self.wrapper}"
+
+    def __call__(self):
+        page = self.current_page()
+        items, has_more = fetch_page(
+            self.prop, page, self.per_page, paginate=self.paginate
+        )
+        return {
+            self.wrapper: items,
+            "meta": {
+                "pageName": self.page_name,
+                "perPage": self.per_page,
+                "currentPage": page,
+                "previousPage": page - 1 if page > 1 else None,
+                "nextPage": page + 1 if has_more else None,
+            },
+        }
+
+
+class OnceProp(CallableProp):
+    __slots__ = ("key", "expires_in", "fresh")
+
+    def __init__(self, prop, key=None, expires_in=None, fresh=False):
+        super().__init__(prop)
+        self.key = key
+        self.expires_in = expires_in
+        self.fresh = fresh
+
+    def once_key(self, name):
+        return self.key or name
+
+    def expires_at(self):
+        if self.expires_in is None:
+            return None
+        expires_in = self.expires_in
+        if isinstance(expires_in, timedelta):
+            expires_in = expires_in.total_seconds()
+        return int((time.time() + expires_in) * 1000)
+
+
+class CachedProp(CallableProp):
+    __slots__ = ("key", "ttl", "stale_ttl", "tags")
+
+    def __init__(self, prop, key, ttl=None, stale_ttl=0, tags=()):
+        super().__init__(prop)
+        self.key = key
+        self.ttl = ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+        self.stale_ttl = (
+            stale_ttl.total_seconds() if isinstance(stale_ttl, timedelta) else stale_ttl
+        )
+        self.tags = (tags,) if isinstance(tags, str) else tuple(tags)
+
+    def resolve(self):
+        return super().__call__()
+
+    def __call__(self):
+        return current_app.extensions["inertia"].prop_cache().get(self)
+
+
+_flags_by_type = {}
+
+
+def prop_flags(value):
+    """Return the type tag of ``value``, ``0`` for plain values."""
+    value_type = type(value)
+    try:
+        return _flags_by_type[value_type]
+    except KeyError:
+        flags = 0
+        for base, flag in (
+            (IgnoreOnFirstLoadProp, PROP_IGNORE_ON_FIRST_LOAD),
+            (DeferredProp, PROP_DEFERRED),
+            (MergeableProp, PROP_MERGEABLE),
+            (ScrollProp, PROP_SCROLL),
+            (OnceProp, PROP_ONCE),
+        ):
+            if issubclass(value_type, base):
+                flags |= flag
+        _flags_by_type[value_type] = flags
+        return flags
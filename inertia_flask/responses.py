@@ -1,33 +1,56 @@
-import json
 from functools import wraps
 from http import HTTPStatus
 
-import requests
 from flask import (
     Response,
     current_app,
-    has_app_context,
     render_template,
-    render_template_string,
     request,
     session,
+    stream_with_context,
 )
-from jinja2.exceptions import TemplateNotFound
-from markupsafe import Markup
-
-from .helpers import deep_transform_callables, validate_type
-from .prop_classes import DeferredProp, IgnoreOnFirstLoadProp, MergeableProp
+from markupsafe import Markup, escape
+
+from .flash import flash_props
+from .headers import inertia_headers
+from .helpers import (
+    deep_transform_callables,
+    dumps_json,
+    has_session,
+    iter_json,
+    iter_json_chunks,
+    validate_type,
+)
+from .prop_classes import (
+    MERGE_APPEND,
+    MERGE_DEEP,
+    MERGE_PREPEND,
+    PROP_DEFERRED,
+    PROP_IGNORE_ON_FIRST_LOAD,
+    PROP_MERGEABLE,
+    PROP_ONCE,
+    PROP_SCROLL,
+    prop_flags,
+)
+from .routes import INERTIA_ROOT, INERTIA_SSR_TEMPLATE, mark_inertia_view
+from .ssr import load_requests
 from .version import get_asset_version
+from .vite import preload_link, preload_tag
 
 INERTIA_REQUEST_ENCRYPT_HISTORY = "_inertia_encrypt_history"
+INERTIA_REQUEST_CLEAR_HISTORY = "_inertia_request_clear_history"
 INERTIA_SESSION_CLEAR_HISTORY = "_inertia_clear_history"
-INERTIA_SSR_TEMPLATE = "inertia.html"
-INERTIA_ROOT = "app"
+MERGE_PROPS_KEYS = {
+    MERGE_APPEND: "mergeProps",
+    MERGE_PREPEND: "prependProps",
+    MERGE_DEEP: "deepMergeProps",
+}
 
 
 class InertiaRequest:
     def __init__(self, flask_request):
         self.flask_request = flask_request
+        self.inertia_headers = inertia_headers(flask_request)
 
     @property
     def headers(self):
@@ -38,19 +61,22 @@ class InertiaRequest:
         return getattr(self.flask_request, "inertia", {})
 
     def is_a_partial_render(self, component):
-        return (
-            "X-Inertia-Partial-Data" in self.headers
-            and self.headers.get("X-Inertia-Partial-Component", "") == component
-        )
+        return self.inertia_headers.is_partial_render(component)
+
+    def is_partial_key(self, key):
+        return self.inertia_headers.is_partial_key(key)
 
     def partial_keys(self):
-        return self.headers.get("X-Inertia-Partial-Data", "").split(",")
+        return self.inertia_headers.partial_data
 
     def reset_keys(self):
-        return self.headers.get("X-Inertia-Reset", "").split(",")
+        return self.inertia_headers.reset
+
+    def except_once_keys(self):
+        return self.inertia_headers.except_once
 
     def is_inertia(self):
-        return "X-Inertia" in self.headers
+        return self.inertia_headers.inertia
 
     def should_encrypt_history(self):
         return validate_type(
@@ -63,6 +89,14 @@ class InertiaRequest:
             name="encrypt_history",
         )
 
+    def should_clear_history(self):
+        clear = getattr(self.flask_request, INERTIA_REQUEST_CLEAR_HISTORY, False)
+        # Consumed by this render, so it does not need to reach the session
+        setattr(self.flask_request, INERTIA_REQUEST_CLEAR_HISTORY, False)
+        if has_session() and INERTIA_SESSION_CLEAR_HISTORY in session:
+            clear = session.pop(INERTIA_SESSION_CLEAR_HISTORY) or clear
+        return clear
+
     def get_full_path(self):
         full_path = self.flask_request.full_path
         if full_path.endswith("?"):
@@ -72,121 +106,128 @@ class InertiaRequest:
 
 class BaseInertiaResponseMixin:
     def page_data(self):
-        clear_history = session.pop(INERTIA_SESSION_CLEAR_HISTORY, False)
+        clear_history = self.request.should_clear_history()
+        _props, _metadata = self.build_props()
 
-        _page = {
+        return {
             "component": self.component,
-            "props": self.build_props(),
+            "props": _props,
             "url": self.request.get_full_path(),
             "version": get_asset_version(self.request.flask_request.blueprint),
             "encryptHistory": self.request.should_encrypt_history(),
             "clearHistory": clear_history,
+            **_metadata,
         }
 
-        _deferred_props = self.build_deferred_props()
-        if _deferred_props:
-            _page["deferredProps"] = _deferred_props
-
-        _merge_props = self.build_merge_props()
-        if _merge_props:
-            _page["mergeProps"] = _merge_props
-
-        return _page
-
-    def build_props(self):
-        _props = {
+    def all_props(self):
+        return {
+            **flash_props(),
             **self.request.inertia,
             **self.props,
             **current_app.extensions["inertia"]._share_data,
         }
 
-        for key in list(_props.keys()):
-            if self.request.is_a_partial_render(self.component):
-                if key not in self.request.partial_keys():
-                    del _props[key]
+    def build_props(self):
+        """Filter, classify and resolve every prop in a single pass.
+
+        Returns the resolved props and the page metadata describing them
+        (deferred groups, merge paths, scroll and once props), empty keys omitted.
+        """
+        is_partial = self.request.is_a_partial_render(self.component)
+        reset_keys = self.request.reset_keys()
+        _props = {}
+        _metadata = {
+            "deferredProps": {},
+            "mergeProps": [],
+            "prependProps": [],
+            "deepMergeProps": [],
+            "matchPropsOn": [],
+            "scrollProps": {},
+            "onceProps": {},
+        }
+        _scroll_keys = []
+
+        for key, prop in self.all_props().items():
+            flags = prop_flags(prop)
+            if is_partial:
+                include = self.request.is_partial_key(key)
             else:
-                if isinstance(_props[key], IgnoreOnFirstLoadProp):
-                    del _props[key]
-
-        return deep_transform_callables(_props)
-
-    def build_deferred_props(self):
-        if self.request.is_a_partial_render(self.component):
-            return None
-
-        _deferred_props = {}
-        for key, prop in self.props.items():
-            if isinstance(prop, DeferredProp):
-                _deferred_props.setdefault(prop.group, []).append(key)
-
-        return _deferred_props
-
-    def build_merge_props(self):
-        return [
-            key
-            for key, prop in self.props.items()
-            if (
-                isinstance(prop, MergeableProp)
-                and prop.should_merge()
-                and key not in self.request.reset_keys()
-            )
-        ]
+                include = not flags & PROP_IGNORE_ON_FIRST_LOAD and not (
+                    flags & PROP_ONCE and self.client_has_once(key, prop)
+                )
+            if include:
+                _props[key] = prop
+            if not flags:
+                continue
+
+            if flags & PROP_DEFERRED and not is_partial:
+                _metadata["deferredProps"].setdefault(prop.group, []).append(key)
+            if flags & PROP_MERGEABLE and prop.should_merge() and key not in reset_keys:
+                path = prop.merge_path(key)
+                _metadata[MERGE_PROPS_KEYS[prop.merge_strategy()]].append(path)
+                _metadata["matchPropsOn"].extend(
+                    f"{path}.{field}" for field in prop.match_on
+                )
+            if flags & PROP_SCROLL and include:
+                _scroll_keys.append(key)
+            if flags & PROP_ONCE and (include or not is_partial):
+                _metadata["onceProps"][prop.once_key(key)] = {
+                    "prop": key,
+                    "expiresAt": prop.expires_at(),
+                }
+
+        _props = deep_transform_callables(_props)
+
+        for key in _scroll_keys:
+            meta = _props[key]["meta"]
+            _metadata["scrollProps"][key] = {
+                "pageName": meta["pageName"],
+                "previousPage": meta["previousPage"],
+                "nextPage": meta["nextPage"],
+                "currentPage": meta["currentPage"],
+                "reset": key in reset_keys,
+            }
+
+        return _props, {key: value for key, value in _metadata.items() if value}
+
+    def client_has_once(self, key, prop):
+        return not prop.fresh and prop.once_key(key) in self.request.except_once_keys()
+
+    def preload_tags(self):
+        """``<link>`` tags loading the page component's chunk and its CSS"""
+        urls = current_app.extensions["inertia"].preload_urls(self.component)
+        return Markup("".join(preload_tag(url) for url in urls))
+
+    def layout_data(self):
+        """Variables of the layout template, ``template_data`` taking precedence"""
+        return {"preload": self.preload_tags(), **self.template_data}
 
     def build_first_load(self, data, blueprint=None):
-        if (
-            current_app.config["INERTIA_SSR_ENABLED"]
-            and current_app.config["DEBUG"] is False
-        ):
+        ext = current_app.extensions["inertia"]
+        if ext.ssr_enabled():
+            requests = load_requests()
             try:
-                response = requests.post(
-                    f"{current_app.config['INERTIA_SSR_URL']}/render",
-                    data=data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5,
-                )
-                response.raise_for_status()
+                rendered = ext.ssr.render(ext.ssr_urls(), data)
                 return render_template(
                     current_app.config.get(
                         "INERTIA_SSR_TEMPLATE", INERTIA_SSR_TEMPLATE
                     ),
-                    inertia=Markup(response.json()["body"]),
-                    **self.template_data,
+                    inertia=Markup(rendered["body"]),
+                    **self.layout_data(),
                 )
             except requests.exceptions.RequestException:
                 current_app.logger.error(
                     "SSR Server not found. Falling back to client-side rendering."
                 )
+        root = current_app.config.get("INERTIA_ROOT", INERTIA_ROOT)
         inertia_div = Markup(
-            render_template_string(
-                f"""<div id="{current_app.config.get("INERTIA_ROOT", INERTIA_ROOT)}" data-page="{{{{ page|escape }}}}"></div>""",
-                page=data,
-            )
+            f'<div id="{escape(root)}" data-page="{escape(data)}"></div>'
         )
-        template_path = current_app.config.get(
-            f"{str(blueprint).upper() + '_' if blueprint is not None else ''}INERTIA_TEMPLATE"
-        )
-        if template_path is None:
-            template_path = current_app.config.get("INERTIA_TEMPLATE")
-            current_app.logger.warning(
-                f"Blueprint template not found for {blueprint}. Using global template."
-            )
-        try:
-            current_app.jinja_env.get_template(template_path)
-        except TemplateNotFound:
-            template_path = current_app.config.get("INERTIA_TEMPLATE")
-            current_app.logger.warning(
-                f"Blueprint template not found: {template_path}. Using global template."
-            )
-        except Exception as e:
-            current_app.logger.error(
-                f"Error loading template: {template_path}. Error: {e}"
-            )
-            raise
         return render_template(
-            template_path,
+            self.route.template,
             page=data,
             inertia=inertia_div,
-            **self.template_data,
+            **self.layout_data(),
         )
 
 
@@ -199,16 +240,28 @@ class InertiaResponse(BaseInertiaResponseMixin, Response):
         template_data=None,
         headers=None,
         *args,
+        stream=None,
+        route=None,
         **kwargs,
     ):
         self.request = InertiaRequest(request)
         self.component = component
         self.props = props or {}
         self.template_data = template_data or {}
+        self.route = route or current_app.extensions["inertia"].get_route(
+            request.endpoint, component
+        )
         self.json_encoder = current_app.config["INERTIA_JSON_ENCODER"]
+        if stream is None:
+            stream = self.route.stream
+        if stream is None:
+            stream = current_app.config["INERTIA_STREAM_JSON"]
         _headers = headers or {}
 
-        data = json.dumps(self.page_data(), cls=self.json_encoder, default=str)
+        if not self.request.is_inertia():
+            _headers = self.preload_headers(request, _headers)
+
+        page = self.page_data()
 
         if self.request.is_inertia():
             _headers = {
@@ -217,40 +270,80 @@ class InertiaResponse(BaseInertiaResponseMixin, Response):
                 "X-Inertia": "true",
                 "Content-Type": "application/json",
             }
-            content = data
+            if stream:
+                content = stream_with_context(
+                    iter_json_chunks(page, self.json_encoder(default=str))
+                )
+            else:
+                content = dumps_json(page, self.json_encoder)
         else:
+            if stream:
+                data = "".join(iter_json(page, self.json_encoder(default=str)))
+            else:
+                data = dumps_json(page, self.json_encoder)
             content = self.build_first_load(data, request.blueprint or None)
 
         super().__init__(content, headers=_headers, *args, **kwargs)
 
+    def preload_headers(self, request, headers):
+        """Add ``Link`` headers preloading the entry and page component assets.
+
+        With ``INERTIA_EARLY_HINTS`` they are also sent as a 103 Early Hints
+        response, on servers that provide ``wsgi.early_hints``, so the browser
+        downloads assets while the page and SSR render.
+        """
+        if not current_app.config["INERTIA_PRELOAD_HEADERS"]:
+            return headers
+        ext = current_app.extensions["inertia"]
+        urls = ext.preload_urls()
+        urls = urls + [
+            url for url in ext.preload_urls(self.component) if url not in urls
+        ]
+        if not urls:
+            return headers
+
+        links = [preload_link(url) for url in urls]
+        early_hints = request.environ.get("wsgi.early_hints")
+        if current_app.config["INERTIA_EARLY_HINTS"] and early_hints is not None:
+            early_hints([("Link", link) for link in links])
+        return {**headers, "Link": ", ".join(links)}
 
-def inertia(component, encrypt=None, clear=False):
+
+def inertia(component, encrypt=None, clear=False, stream=None, prerender=False):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Check if the current app has the Inertia middleware initialized
-            if not has_app_context() or "inertia" not in current_app.extensions:
+            try:
+                ext = current_app.extensions["inertia"]
+            except KeyError:
                 raise RuntimeError(
                     "Inertia middleware is not initialized in the current app context."
-                )
-            if encrypt is not None:
-                encrypt_history(encrypt)
-            if clear:
+                ) from None
+            route = ext.get_route(
+                request.endpoint, component, encrypt, clear, stream, prerender
+            )
+            if route.encrypt is not None:
+                encrypt_history(route.encrypt)
+            if route.clear:
                 clear_history()
             props = f(*args, **kwargs)
 
             # If something other than a dict is returned, return it directly
             if not isinstance(props, dict):
                 return props
-            return InertiaResponse(request, component, props)
+            return InertiaResponse(request, component, props, route=route)
 
-        return decorated_function
+        return mark_inertia_view(
+            decorated_function, component, encrypt, clear, stream, prerender
+        )
 
     return decorator
 
 
-def render(request, component, props=None, template_data=None):
-    return InertiaResponse(request, component, props or {}, template_data or {})
+def render(request, component, props=None, template_data=None, stream=None):
+    return InertiaResponse(
+        request, component, props or {}, template_data or {}, stream=stream
+    )
 
 
 def location(url):
@@ -266,4 +359,10 @@ def encrypt_history(value=True):
 
 
 def clear_history():
-    session[INERTIA_SESSION_CLEAR_HISTORY] = True
+    setattr(request, INERTIA_REQUEST_CLEAR_HISTORY, True)
+
+
+def persist_history():
+    """Keep a clear history request that was not rendered for the next page."""
+    if getattr(request, INERTIA_REQUEST_CLEAR_HISTORY, False):
+        session[INERTIA_SESSION_CLEAR_HISTORY] = True
@@ -0,0 +1,89 @@
+"""Per-endpoint Inertia metadata, resolved once per app instead of per request
+
+Only what is fixed once the app is set up is resolved here. Settings that may
+change while the app runs, e.g. ``DEBUG`` or the SSR settings, are read when
+the response is built.
+"""
+
+from typing import NamedTuple, Optional
+
+from .utils import get_template_name
+
+INERTIA_ROUTE_ATTRIBUTE = "inertia_route"
+INERTIA_SSR_TEMPLATE = "inertia.html"
+INERTIA_ROOT = "app"
+
+
+class InertiaRoute(NamedTuple):
+    """The decorator options and layout template of an Inertia endpoint
+
+    ``stream`` is ``None`` when ``INERTIA_STREAM_JSON`` decides.
+    """
+
+    endpoint: Optional[str]
+    rules: tuple
+    component: str
+    encrypt: Optional[bool]
+    clear: bool
+    stream: Optional[bool]
+    prerender: bool
+    template: Optional[str]
+
+
+def mark_inertia_view(
+    view, component, encrypt=None, clear=False, stream=None, prerender=False
+):
+    """Attach the ``inertia`` decorator arguments to ``view`` for the registry."""
+    setattr(
+        view,
+        INERTIA_ROUTE_ATTRIBUTE,
+        {
+            "component": component,
+            "encrypt": encrypt,
+            "clear": clear,
+            "stream": stream,
+            "prerender": prerender,
+        },
+    )
+    return view
+
+
+def make_route(
+    app,
+    endpoint,
+    component,
+    encrypt=None,
+    clear=False,
+    stream=None,
+    prerender=False,
+    rules=(),
+):
+    """Resolve the layout template of a single Inertia endpoint."""
+    blueprint_name = endpoint.rpartition(".")[0] if endpoint else ""
+    blueprint = app.blueprints.get(blueprint_name) if blueprint_name else None
+    return InertiaRoute(
+        endpoint=endpoint,
+        rules=tuple(rules),
+        component=component,
+        encrypt=encrypt,
+        clear=clear,
+        stream=stream,
+        prerender=prerender,
+        template=get_template_name(blueprint),
+    )
+
+
+def build_route_registry(app):
+    """Return a mapping of endpoint to :class:`InertiaRoute` for every Inertia view."""
+    rules = {}
+    for rule in app.url_map.iter_rules():
+        rules.setdefault(rule.endpoint, []).append(rule.rule)
+
+    registry = {}
+    for endpoint, view in app.view_functions.items():
+        spec = getattr(view, INERTIA_ROUTE_ATTRIBUTE, None)
+        if spec is not None:
+            registry[endpoint] = make_route(
+                app, endpoint, rules=rules.get(endpoint, ()), **spec
+            )
+    return registry
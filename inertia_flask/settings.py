@@ -8,15 +8,32 @@ class Settings:
 
     INERTIA_JSON_ENCODER = InertiaJsonEncoder
     INERTIA_ENCRYPT_HISTORY = False
+    INERTIA_STREAM_JSON = False
+    INERTIA_VERSION = None
+    INERTIA_VERSION_STRATEGY = "template"
+    INERTIA_VERSION_FILE = None
+    INERTIA_CACHE_FILE = None
+    INERTIA_CACHE_BACKEND = None
     INERTIA_SSR_ENABLED = False
     INERTIA_SSR_URL = "http://localhost:13714"
+    INERTIA_SSR_WORKERS = 1
+    INERTIA_SSR_BUNDLE = "dist/server/ssr.js"
     INERTIA_ROOT = "app"
     INERTIA_STATIC_ENDPOINT = "static"
+    INERTIA_ASSETS_URL = None
+    INERTIA_ASSETS_DIR = None
     INERTIA_VITE_ORIGIN = "http://localhost:5173"
     INERTIA_VITE_MANIFEST_PATH = None
     INERTIA_VITE_SSR_MANIFEST_PATH = None
     INERTIA_VITE_DEV = None
+    INERTIA_VITE_PROBE_TTL = 5
+    INERTIA_PRELOAD_HEADERS = False
+    INERTIA_EARLY_HINTS = False
     INERTIA_VITE_DIR = "inertia"
+    INERTIA_VITE_PAGES_DIR = "src/Pages"
+    INERTIA_VITE_ENTRY = None
+    INERTIA_PRERENDER_DIR = "prerendered"
+    INERTIA_PRERENDER_SERVE = False
 
 
 def init_settings(app):
@@ -0,0 +1,123 @@
+"""Transport to the Inertia server-side rendering server"""
+
+import os
+import threading
+import weakref
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
+
+_clients = weakref.WeakSet()
+
+
+def _reset_clients():
+    # Pooled sockets must never be shared between forked workers
+    for client in list(_clients):
+        client.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients)
+
+
+def load_requests():
+    """Import ``requests``, which only apps rendering server-side need."""
+    import requests
+
+    return requests
+
+
+@lru_cache(maxsize=16)
+def ssr_urls(url, workers=1):
+    """Return the URLs of ``workers`` SSR servers on consecutive ports from ``url``."""
+    if workers is None or workers <= 1:
+        return (url,)
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return tuple(
+        urlunsplit(parts._replace(netloc=f"{parts.hostname}:{port + index}"))
+        for index in range(workers)
+    )
+
+
+class SSRClient:
+    """Keeps a pooled HTTP session to the SSR servers across requests.
+
+    Renders are sent to the server with the fewest requests in flight from
+    this process, so slow pages do not queue up behind each other.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._outstanding = {}
+        self._lock = threading.Lock()
+        self._turn = 0
+        _clients.add(self)
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = load_requests().Session()
+        return self._session
+
+    def reset(self):
+        """Drop pooled connections, e.g. after the process forked."""
+        self._session = None
+        self._outstanding = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, urls, exclude=()):
+        with self._lock:
+            # Rotate the starting point so ties are spread across servers
+            self._turn = (self._turn + 1) % len(urls)
+            candidates = [
+                url
+                for url in urls[self._turn :] + urls[: self._turn]
+                if url not in exclude
+            ]
+            url = min(candidates, key=lambda url: self._outstanding.get(url, 0))
+            self._outstanding[url] = self._outstanding.get(url, 0) + 1
+        return url
+
+    def _release(self, url):
+        with self._lock:
+            self._outstanding[url] -= 1
+
+    def render(self, url, data, timeout=5):
+        """Render the page ``data`` and return the SSR server's JSON payload.
+
+        :param url: URL of the SSR server, or a sequence of URLs to balance across.
+            A server that refuses the connection (e.g. while it restarts) is
+            retried once on another one.
+        """
+        requests = load_requests()
+        urls = (url,) if isinstance(url, str) else tuple(url)
+        tried = []
+        while True:
+            target = self._acquire(urls, exclude=tried)
+            try:
+                response = self.session.post(
+                    f"{target}/render",
+                    data=data,
+                    headers={"Content-Type": "application/json"},
+                    timeout=timeout,
+                )
+            except requests.exceptions.ConnectionError:
+                tried.append(target)
+                if len(tried) >= min(2, len(urls)):
+                    raise
+                continue
+            finally:
+                self._release(target)
+            response.raise_for_status()
+            return response.json()
+
+    def warmup(self, url, timeout=5):
+        """Open a connection to the SSR servers, returning whether they are healthy."""
+        requests = load_requests()
+        urls = (url,) if isinstance(url, str) else tuple(url)
+        try:
+            for target in urls:
+                self.session.get(f"{target}/health", timeout=timeout).raise_for_status()
+        except requests.exceptions.RequestException:
+            return False
+        return True
@@ -0,0 +1,297 @@
+"""Supervision of the long-running processes started by the CLI"""
+
+import asyncio
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Supervisor:
+    """Runs child processes and restarts any that exit until interrupted.
+
+    Restarts back off exponentially, so a worker that crashes on startup does
+    not spin; the delay resets once a process has stayed up for a while. Each
+    process runs in its own process group, stopped as a whole on Ctrl+C or
+    SIGTERM (e.g. ``docker stop``).
+    """
+
+    def __init__(self, restart_delay=0.5, max_restart_delay=30, poll_interval=0.5):
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.poll_interval = poll_interval
+        self.children = {}
+
+    def add(self, name, args, **popen_kwargs):
+        """Register a process to start with ``subprocess.Popen(args, **popen_kwargs)``."""
+        self.children[name] = {
+            "args": args,
+            "kwargs": popen_kwargs,
+            "process": None,
+            "started": 0.0,
+            "failures": 0,
+            "restart_at": 0.0,
+        }
+
+    def spawn(self, name):
+        child = self.children[name]
+        child["process"] = subprocess.Popen(
+            child["args"], **{"start_new_session": True, **child["kwargs"]}
+        )
+        child["started"] = time.monotonic()
+        return child["process"]
+
+    def start(self):
+        for name in self.children:
+            self.spawn(name)
+
+    def poll(self):
+        """Restart exited processes whose back-off elapsed; return their names."""
+        now = time.monotonic()
+        restarted = []
+        for name, child in self.children.items():
+            process = child["process"]
+            if process is not None and process.poll() is None:
+                continue
+            if process is not None:
+                # Schedule the restart the first time the exit is seen
+                uptime = now - child["started"]
+                if uptime > self.max_restart_delay:
+                    child["failures"] = 0
+                delay = min(
+                    self.restart_delay * 2 ** child["failures"],
+                    self.max_restart_delay,
+                )
+                child["failures"] += 1
+                child["restart_at"] = now + delay
+                child["process"] = None
+                print(
+                    f"[{name}] exited with code {process.returncode}, "
+                    f"restarting in {delay:g}s"
+                )
+            if now >= child["restart_at"]:
+                self.spawn(name)
+                restarted.append(name)
+        return restarted
+
+    def run(self):
+        """Start every process and keep them running until interrupted."""
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, _interrupt)
+        self.start()
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                self.poll()
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+        finally:
+            self.stop()
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+
+    def stop(self, timeout=5):
+        processes = [
+            child["process"]
+            for child in self.children.values()
+            if child["process"] is not None
+        ]
+        for process in processes:
+            terminate_group(process)
+        for process in processes:
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kill_group(process)
+                process.wait()
+
+
+def _interrupt(signum, frame):
+    # SIGTERM stops the children like Ctrl+C instead of orphaning them
+    raise KeyboardInterrupt
+
+
+def terminate_group(process):
+    """Terminate ``process`` along with the children it started.
+
+    The process must have been started with ``start_new_session=True``, so it
+    leads its own process group. Package managers run the build in a child,
+    which would otherwise keep running, and keep the output pipe open.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+    except ProcessLookupError:
+        pass
+
+
+def kill_group(process):
+    """Kill ``process`` and its children, once they ignored ``terminate_group``."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def run_parallel(jobs, max_workers=None):
+    """Run ``(name, args, cwd)`` jobs concurrently with their output prefixed by name.
+
+    At most ``max_workers`` processes run at once. When a job fails, or its
+    command cannot be started, the running ones are terminated and the pending
+    ones skipped. Returns a mapping of job name to exit code, ``127`` for jobs
+    that could not start and ``None`` for skipped jobs.
+    """
+    lock = threading.Lock()
+    running = {}
+    failed = threading.Event()
+
+    def fail():
+        # Called with the lock held
+        if not failed.is_set():
+            failed.set()
+            for other in running.values():
+                terminate_group(other)
+
+    def run(name, args, cwd):
+        with lock:
+            if failed.is_set():
+                return None
+            try:
+                process = subprocess.Popen(
+                    args,
+                    cwd=cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    start_new_session=True,
+                )
+            except OSError as error:
+                # e.g. the package manager is not installed
+                print(f"[{name}] {error}")
+                fail()
+                return 127
+            running[name] = process
+        for line in process.stdout:
+            with lock:
+                print(f"[{name}] {line.rstrip()}")
+        returncode = process.wait()
+        with lock:
+            running.pop(name)
+            if returncode != 0:
+                fail()
+        return returncode
+
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(run, name, args, cwd) for name, args, cwd in jobs
+        }
+    return {name: future.result() for name, future in futures.items()}
+
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+class DevServer:
+    """Runs the dev server processes together until one of them stops.
+
+    Every output pipe is read as data arrives, so an idle stream never holds
+    up the others. A child whose output matches its ``ready`` pattern is
+    announced once. Stopping any child, or Ctrl+C, stops them all, along with
+    the processes they started, such as Vite under a package manager.
+    """
+
+    def __init__(self, stop_timeout=5):
+        self.stop_timeout = stop_timeout
+        self.children = []
+        self.ready = []
+
+    def add(self, name, args, ready=None, on_ready=None, **kwargs):
+        """Register a process to start with ``args``, e.g. with ``cwd`` or ``env``.
+
+        :param ready: Pattern matched against the output to detect readiness
+        :param on_ready: Called with the ``ready`` match once the process is ready
+        """
+        pattern = re.compile(ready) if ready is not None else None
+        self.children.append((name, args, (pattern, on_ready), kwargs))
+
+    def run(self):
+        """Start every process and return the exit code of the first to stop."""
+        try:
+            return asyncio.run(self._run())
+        except KeyboardInterrupt:
+            print("\nShutting down servers...")
+            return 0
+
+    async def _run(self):
+        processes = []
+        pumps = []
+        try:
+            for name, args, ready, kwargs in self.children:
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=1 << 20,
+                    start_new_session=True,
+                    **kwargs,
+                )
+                processes.append((name, process))
+                pumps.append(
+                    asyncio.ensure_future(
+                        self._pump(name, process.stdout, sys.stdout, ready)
+                    )
+                )
+                pumps.append(
+                    asyncio.ensure_future(
+                        self._pump(name, process.stderr, sys.stderr, ready)
+                    )
+                )
+
+            waiters = {
+                asyncio.ensure_future(process.wait()): name
+                for name, process in processes
+            }
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            waiter = done.pop()
+            returncode = waiter.result()
+            print(f"[{waiters[waiter]}] exited with code {returncode}, shutting down")
+            return returncode
+        finally:
+            await self._stop(processes)
+            await asyncio.gather(*pumps, return_exceptions=True)
+
+    async def _pump(self, name, stream, output, ready):
+        async for raw in stream:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            print(f"[{name}] {line}", file=output, flush=True)
+            pattern, on_ready = ready
+            if pattern is None or name in self.ready:
+                continue
+            match = pattern.search(ANSI_ESCAPE.sub("", line))
+            if match:
+                self.ready.append(name)
+                print(f"[{name}] ready", flush=True)
+                if on_ready is not None:
+                    on_ready(match)
+
+    async def _stop(self, processes):
+        # Children that exited may have left e.g. Vite behind, holding the pipes
+        for _, process in processes:
+            terminate_group(process)
+        for _, process in processes:
+            try:
+                await asyncio.wait_for(process.wait(), self.stop_timeout)
+            except asyncio.TimeoutError:
+                kill_group(process)
+                await process.wait()
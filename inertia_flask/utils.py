@@ -1,10 +1,23 @@
+import copy
 import json
 import warnings
 
-from flask import current_app
+from flask import current_app, has_app_context
 from jinja2 import TemplateNotFound
 
-from .prop_classes import DeferredProp, MergeProp, OptionalProp
+from .helpers import RawJSON
+from .prop_classes import (
+    MERGE_APPEND,
+    MERGE_DEEP,
+    MERGE_PREPEND,
+    CachedProp,
+    CallableProp,
+    DeferredProp,
+    MergeProp,
+    OnceProp,
+    OptionalProp,
+    ScrollProp,
+)
 
 
 class InertiaJsonEncoder(json.JSONEncoder):
@@ -29,8 +42,115 @@ def defer(prop, group="default", merge=False):
     return DeferredProp(prop, group=group, merge=merge)
 
 
-def merge(prop):
-    return MergeProp(prop)
+def merge(prop, prepend=False, deep=False, match_on=()):
+    """Merge ``prop`` into the client's existing value instead of replacing it.
+
+    :param prepend: Prepend new items instead of appending them
+    :param deep: Deep merge nested objects instead of a shallow merge
+    :param match_on: Field name(s) used to update existing items in place
+    """
+    if deep and prepend:
+        raise ValueError("merge() cannot both prepend and deep merge")
+    if deep:
+        strategy = MERGE_DEEP
+    elif prepend:
+        strategy = MERGE_PREPEND
+    else:
+        strategy = MERGE_APPEND
+    return MergeProp(prop, strategy=strategy, match_on=match_on)
+
+
+def scroll(
+    prop=None,
+    per_page=15,
+    page_name="page",
+    wrapper="data",
+    match_on=(),
+    paginate=None,
+):
+    """Paginate ``prop`` for infinite scrolling.
+
+    Only the page requested through the ``page_name`` query argument is fetched
+    from ``prop`` (a query, sequence or iterator, or a callable returning one)
+    and the client merges it into the rows it already holds.
+
+    :param paginate: Callable taking ``(offset, limit)`` and returning the rows,
+        used instead of ``prop``
+    """
+    if prop is None and paginate is None:
+        raise ValueError("scroll() needs a prop or a paginate callable")
+    return ScrollProp(
+        prop,
+        per_page=per_page,
+        page_name=page_name,
+        wrapper=wrapper,
+        match_on=match_on,
+        paginate=paginate,
+    )
+
+
+def once(prop, key=None, expires_in=None, fresh=False):
+    """Only resolve and send ``prop`` when the client does not already hold it.
+
+    :param key: Identifier shared across pages (defaults to the prop name)
+    :param expires_in: Seconds (or ``timedelta``) the client may reuse the value
+    :param fresh: Always resolve and send the value, refreshing the client copy
+    """
+    return OnceProp(prop, key=key, expires_in=expires_in, fresh=fresh)
+
+
+def cached(prop, key=None, ttl=None, stale_ttl=0, tags=()):
+    """Reuse the value of ``prop`` across requests instead of resolving it each time.
+
+    ``prop`` may also be an ``optional``, ``defer``, ``merge`` or ``once`` prop,
+    whose value is then cached while it keeps its behaviour.
+
+    :param key: Cache key (defaults to the function's qualified name). Required
+        for lambdas and functions defined in a view, whose value may depend on
+        the variables they capture
+    :param ttl: Seconds (or ``timedelta``) the value is fresh, forever if ``None``
+    :param stale_ttl: Seconds a stale value is still sent while it is refreshed
+        in the background
+    :param tags: Tag(s) to expire the value with ``invalidate_cached``
+    """
+    if isinstance(prop, ScrollProp):
+        raise ValueError("Scroll props are paginated per request and cannot be cached")
+    wrapper = None
+    if isinstance(prop, CallableProp):
+        wrapper, prop = copy.copy(prop), prop.prop
+    if key is None:
+        qualname = getattr(prop, "__qualname__", "<lambda>")
+        if not callable(prop) or "<lambda>" in qualname or "<locals>" in qualname:
+            raise ValueError(
+                "cached() needs a key for lambdas, local functions and values"
+            )
+        key = f"{prop.__module__}.{qualname}"
+    cached_prop = CachedProp(prop, key, ttl=ttl, stale_ttl=stale_ttl, tags=tags)
+    if wrapper is None:
+        return cached_prop
+    wrapper.prop = cached_prop
+    return wrapper
+
+
+def raw_json(value):
+    """Send ``value``, an encoded JSON document, as is instead of re-encoding it.
+
+    It is only checked to be valid JSON in debug mode.
+
+    :param value: JSON as ``str`` or UTF-8 ``bytes``, e.g. read from a cache or API
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value).decode("utf-8")
+    elif not isinstance(value, str):
+        raise TypeError(
+            f"Expected str or bytes for raw_json, got {type(value).__name__}"
+        )
+    if has_app_context() and current_app.debug:
+        try:
+            json.loads(value)
+        except ValueError as exception:
+            raise ValueError(f"raw_json received invalid JSON: {exception}") from None
+    return RawJSON(value)
 
 
 def template_exists(template_name):
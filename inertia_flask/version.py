@@ -8,7 +8,76 @@ from .utils import get_template_name
 
 
 def get_asset_version(blueprint=None) -> str:
+    """Return the asset version, cached unless Jinja auto reloads templates.
+
+    A version stored in the shared artifact file takes precedence, so workers
+    switch together when a new build is warmed up.
+    """
+    inertia = current_app.extensions.get("inertia")
+    if inertia is None or current_app.jinja_env.auto_reload:
+        return compute_asset_version(blueprint)
+
+    version = inertia.get_shared_version(blueprint)
+    if version is not None:
+        return version
+
+    versions = inertia.state().asset_versions
+    if blueprint not in versions:
+        versions[blueprint] = compute_asset_version(blueprint)
+    return versions[blueprint]
+
+
+def compute_asset_version(blueprint=None) -> str:
     """Calculate asset version to allow Inertia to automatically make a full page visit in case of changes."""
+    version = current_app.config.get("INERTIA_VERSION")
+    if version is not None:
+        return str(version(blueprint) if callable(version) else version)
+
+    strategy = current_app.config.get("INERTIA_VERSION_STRATEGY", "template")
+    if strategy == "manifest":
+        return get_manifest_version()
+    elif strategy == "file":
+        return get_file_version()
+    elif strategy == "template":
+        return get_template_version(blueprint)
+    raise ValueError(f"Unknown INERTIA_VERSION_STRATEGY: {strategy}")
+
+
+def get_manifest_version() -> str:
+    """Hash the hashed output filenames listed in the Vite manifest."""
+    try:
+        manifest = current_app.extensions["inertia"].get_manifest()
+    except OSError as e:
+        current_app.logger.error(f"Failed to read Vite manifest: {e}")
+        return ""
+
+    files = set()
+    for chunk in manifest.values():
+        files.add(chunk.get("file", ""))
+        files.update(chunk.get("css", []))
+        files.update(chunk.get("assets", []))
+    return hashlib.sha256("\n".join(sorted(files)).encode("utf-8")).hexdigest()
+
+
+def get_file_version() -> str:
+    """Read the version written to ``INERTIA_VERSION_FILE`` at build time."""
+    version_file = current_app.config.get("INERTIA_VERSION_FILE")
+    if version_file is None:
+        raise ValueError(
+            "Version file is not set. Set INERTIA_VERSION_FILE in your config."
+        )
+    try:
+        with open(
+            os.path.join(current_app.root_path, version_file), encoding="utf-8"
+        ) as content:
+            return content.read().strip()
+    except OSError as e:
+        current_app.logger.error(f"Failed to read version file: {e}")
+        return ""
+
+
+def get_template_version(blueprint=None) -> str:
+    """Hash the layout template source and its modification time."""
     blueprint_class = (
         current_app.blueprints[blueprint] if blueprint is not None else None
     )
@@ -0,0 +1,164 @@
+"""Access to the Vite build manifest"""
+
+import json
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from markupsafe import escape
+
+# Written in the Vite project directory by ``flask vite dev`` while Vite runs
+VITE_HOT_FILE = "hot"
+PAGE_EXTENSIONS = (".tsx", ".jsx", ".ts", ".js", ".vue", ".svelte")
+
+
+class ViteManifest:
+    """Parsed Vite manifest, re-read only when the file on disk changes.
+
+    Checking the file's stat is far cheaper than parsing it on every render and
+    still picks up a ``flask vite build`` run against a live server.
+    """
+
+    def __init__(self):
+        self._cached = (None, {})
+
+    def load(self, manifest_path):
+        """Return the parsed manifest, raising ``OSError`` if it is missing."""
+        stat = os.stat(manifest_path)
+        stamp = (manifest_path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached_stamp, manifest = self._cached
+        if stamp != cached_stamp:
+            with open(manifest_path, encoding="utf-8") as content:
+                manifest = json.load(content)
+            self._cached = (stamp, manifest)
+        return manifest
+
+
+def manifest_chunks(manifest, keys):
+    """Return the JS and CSS files of the chunks ``keys`` and their static imports."""
+    scripts, styles = [], []
+    seen = set()
+
+    def visit(key):
+        if key in seen or key not in manifest:
+            return
+        seen.add(key)
+        chunk = manifest[key]
+        filename = chunk.get("file")
+        if filename:
+            (styles if filename.endswith(".css") else scripts).append(filename)
+        styles.extend(css for css in chunk.get("css", []) if css not in styles)
+        for imported in chunk.get("imports", []):
+            visit(imported)
+
+    for key in keys:
+        visit(key)
+    return scripts, styles
+
+
+def manifest_files(manifest):
+    """Every file the build wrote for the chunks of ``manifest``."""
+    files = set()
+    for chunk in manifest.values():
+        if "file" in chunk:
+            files.add(chunk["file"])
+        files.update(chunk.get("css", ()))
+        files.update(chunk.get("assets", ()))
+    return frozenset(files)
+
+
+def component_keys(pages_dir, component):
+    """Manifest keys the source file of the page ``component`` may have."""
+    return [f"{pages_dir}/{component}{extension}" for extension in PAGE_EXTENSIONS]
+
+
+def preload_link(url):
+    """``Link`` header value preloading the JS or CSS file at ``url``."""
+    if url.endswith(".css"):
+        return f"<{url}>; rel=preload; as=style"
+    return f"<{url}>; rel=modulepreload"
+
+
+def preload_tag(url):
+    """HTML tag loading the CSS or preloading the JS file at ``url``."""
+    if url.endswith(".css"):
+        return f'<link rel="stylesheet" href="{escape(url)}">'
+    return f'<link rel="modulepreload" href="{escape(url)}">'
+
+
+class ViteDevProbe:
+    """The origin of the running Vite dev server, read from its hot file.
+
+    ``flask vite dev`` writes the origin Vite listens on to the hot file and
+    removes it on exit. Without a hot file, e.g. for a Vite server started on
+    its own, the configured origin is probed instead. An origin is probed when
+    it is first seen (or the file changes), then again in the background at
+    most once per TTL, so a file left behind by a killed dev server stops
+    counting without requests waiting on it.
+    """
+
+    def __init__(self):
+        self._cached = (None, None, False, 0.0)
+        self._lock = threading.Lock()
+        self._probing = False
+
+    def origin(self, hot_file, origin=None, ttl=5, timeout=0.2):
+        """Return the dev server origin, or ``None`` if it is not running.
+
+        :param origin: Origin probed when there is no hot file
+        """
+        try:
+            stat = os.stat(hot_file)
+            stamp = (hot_file, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            if origin is None:
+                return None
+            stat, stamp = None, (None, origin)
+        cached_stamp, cached_origin, running, checked = self._cached
+        if stamp != cached_stamp:
+            if stat is not None:
+                try:
+                    with open(hot_file, encoding="utf-8") as content:
+                        origin = content.read().strip() or None
+                except OSError:
+                    return None
+            running = origin is not None and self.probe(origin, timeout)
+            self._cached = (stamp, origin, running, time.monotonic())
+        else:
+            origin = cached_origin
+            if origin is not None and time.monotonic() >= checked + ttl:
+                self.probe_later(stamp, origin, timeout)
+        return origin if running else None
+
+    def is_running(self, hot_file, origin=None, ttl=5, timeout=0.2):
+        return self.origin(hot_file, origin, ttl, timeout) is not None
+
+    def probe_later(self, stamp, origin, timeout=0.2):
+        """Re-check ``origin`` in a background thread, one at a time."""
+        with self._lock:
+            if self._probing:
+                return
+            self._probing = True
+
+        def probe():
+            try:
+                running = self.probe(origin, timeout)
+                if self._cached[0] == stamp:
+                    self._cached = (stamp, origin, running, time.monotonic())
+            finally:
+                with self._lock:
+                    self._probing = False
+
+        threading.Thread(target=probe, daemon=True).start()
+
+    @staticmethod
+    def probe(origin, timeout=0.2):
+        parts = urlsplit(origin)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        try:
+            with socket.create_connection((parts.hostname, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
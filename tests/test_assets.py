@@ -0,0 +1,117 @@
+import gzip
+import json
+import os
+
+import pytest
+from flask import Flask
+
+from inertia_flask import Inertia
+from inertia_flask.assets import compress_assets, is_hashed
+
+SCRIPT = b"console.log('inertia');\n" * 100
+
+
+class TestAssets:
+    """Tests for serving Vite's build output"""
+
+    @pytest.fixture
+    def assets_dir(self, tmp_path):
+        (tmp_path / "assets").mkdir()
+        (tmp_path / "assets" / "app-BxF9a2Qz.js").write_bytes(SCRIPT)
+        (tmp_path / "favicon.svg").write_bytes(b"<svg></svg>")
+        return tmp_path
+
+    @pytest.fixture
+    def client(self, assets_dir):
+        app = Flask(__name__)
+        app.config["INERTIA_ASSETS_URL"] = "/build"
+        app.config["INERTIA_ASSETS_DIR"] = str(assets_dir)
+        Inertia(app)
+        return app.test_client()
+
+    def test_hashed_names(self):
+        assert is_hashed("assets/app-BxF9a2Qz.js")
+        assert is_hashed("assets/index.4f3c2a1b.css")
+        assert not is_hashed("favicon.svg")
+        assert not is_hashed("robots.txt")
+        assert not is_hashed("apple-touch-icon.png")
+        assert not is_hashed("site-manifest.json")
+        assert not is_hashed("assets/og-image-large.png")
+        assert not is_hashed("assets/jquery.datepicker.js")
+        # Outside Vite's assets directory, e.g. copied from public/
+        assert not is_hashed("app-BxF9a2Qz.js")
+
+    def test_hashed_from_manifest(self):
+        files = frozenset({"assets/logo-Dk3pQ.svg"})
+        assert is_hashed("assets/logo-Dk3pQ.svg", files)
+        assert not is_hashed("assets/app-BxF9a2Qz.js", files)
+
+    def test_manifest_decides(self, assets_dir):
+        (assets_dir / "manifest.json").write_text(
+            json.dumps({"src/main.tsx": {"file": "favicon.svg", "isEntry": True}})
+        )
+        app = Flask(__name__)
+        app.config["INERTIA_ASSETS_URL"] = "/build"
+        app.config["INERTIA_ASSETS_DIR"] = str(assets_dir)
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(assets_dir / "manifest.json")
+        Inertia(app)
+        client = app.test_client()
+        assert client.get("/build/favicon.svg").cache_control.immutable
+        assert not client.get("/build/assets/app-BxF9a2Qz.js").cache_control.immutable
+
+    def test_endpoint_disabled_by_default(self):
+        app = Flask(__name__)
+        Inertia(app)
+        assert "inertia_assets" not in app.view_functions
+
+    def test_hashed_asset_is_immutable(self, client):
+        response = client.get("/build/assets/app-BxF9a2Qz.js")
+        assert response.status_code == 200
+        assert response.data == SCRIPT
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 31536000
+        assert "Accept-Encoding" in response.vary
+
+    def test_unhashed_asset_is_revalidated(self, client):
+        response = client.get("/build/favicon.svg")
+        assert response.status_code == 200
+        assert not response.cache_control.immutable
+
+    def test_precompressed(self, client, assets_dir):
+        assert compress_assets(str(assets_dir)) >= 1
+        # Too small to be worth compressing
+        assert not os.path.exists(assets_dir / "favicon.svg.gz")
+
+        response = client.get(
+            "/build/assets/app-BxF9a2Qz.js", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/javascript"
+        assert gzip.decompress(response.data) == SCRIPT
+
+        response = client.get(
+            "/build/assets/app-BxF9a2Qz.js", headers={"Accept-Encoding": "identity"}
+        )
+        assert "Content-Encoding" not in response.headers
+        assert response.data == SCRIPT
+
+    def test_stale_precompressed_ignored(self, client, assets_dir):
+        compress_assets(str(assets_dir))
+        script = assets_dir / "assets" / "app-BxF9a2Qz.js"
+        script.write_bytes(SCRIPT * 2)
+        stat = os.stat(script)
+        os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        response = client.get(
+            "/build/assets/app-BxF9a2Qz.js", headers={"Accept-Encoding": "gzip"}
+        )
+        assert "Content-Encoding" not in response.headers
+        assert response.data == SCRIPT * 2
+
+    def test_compress_skips_up_to_date(self, assets_dir):
+        compress_assets(str(assets_dir))
+        assert compress_assets(str(assets_dir)) == 0
+
+    def test_missing_and_escaping_paths(self, client):
+        assert client.get("/build/assets/missing.js").status_code == 404
+        assert client.get("/build/../test_assets.py").status_code == 404
@@ -0,0 +1,116 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from inertia_flask import cached, defer, invalidate_cached, optional, scroll
+from inertia_flask.cache import MemoryCache, PropCache
+from inertia_flask.prop_classes import CachedProp, DeferredProp
+from tests.test_inertia import TestInertia
+
+
+def get_posts():
+    return []
+
+
+class TestCached(TestInertia):
+    root = "app"
+    route = "/cached"
+    component = "component"
+
+    def calls(self, app):
+        return app.config.get("CACHED_CALLS", 0)
+
+    def test_resolved_once(self, test_client, app):
+        for _ in range(3):
+            response = test_client.get(self.route)
+            page = self.parse_initial_response(response)
+            assert page["props"] == {"name": "Alice", "posts": [{"id": 1}]}
+            assert page["deferredProps"] == {"archive": ["archive"]}
+        assert self.calls(app) == 1
+
+    def test_deferred_partial(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers.update(
+            {
+                "X-Inertia-Partial-Data": "archive",
+                "X-Inertia-Partial-Component": self.component,
+            }
+        )
+        for _ in range(2):
+            response = test_client.get(self.route, headers=headers)
+            assert json.loads(response.data)["props"] == {"archive": [{"id": 1}]}
+        assert self.calls(app) == 1
+
+    def test_invalidate_tags(self, test_client, app):
+        test_client.get(self.route)
+        with app.app_context():
+            invalidate_cached("posts")
+        test_client.get(self.route)
+        assert self.calls(app) == 2
+
+        with app.app_context():
+            invalidate_cached(keys=["posts"])
+        test_client.get(self.route)
+        assert self.calls(app) == 3
+
+
+class TestPropCache:
+    """Tests for the cache behind ``cached`` props"""
+
+    def test_ttl_and_stale_while_revalidate(self, app):
+        values = iter(range(10))
+        prop = CachedProp(lambda: next(values), "count", ttl=60, stale_ttl=60)
+        cache = PropCache()
+        with app.app_context():
+            assert cache.get(prop) == 0
+            assert cache.get(prop) == 0
+
+            # Stale: the old value is sent while a refresh runs in the background
+            with patch("time.time", return_value=time.time() + 90):
+                assert cache.get(prop) == 0
+                cache.wait()
+                assert cache.get(prop) == 1
+
+    def test_expired_without_stale_ttl(self, app):
+        values = iter(range(10))
+        prop = CachedProp(lambda: next(values), "count", ttl=60)
+        cache = PropCache()
+        with app.app_context():
+            assert cache.get(prop) == 0
+            with patch("time.time", return_value=time.time() + 90):
+                assert cache.get(prop) == 1
+
+    def test_memory_cache_timeout(self):
+        cache = MemoryCache()
+        cache.set("forever", 1, timeout=0)
+        cache.set("short", 2, timeout=10)
+        with patch("time.monotonic", return_value=time.monotonic() + 20):
+            assert cache.get("forever") == 1
+            assert cache.get("short") is None
+        assert cache.delete("forever")
+        assert cache.get("forever") is None
+
+    def test_wraps_prop_types(self):
+        prop = cached(defer(get_posts, group="posts"), ttl=5)
+        assert isinstance(prop, DeferredProp)
+        assert prop.group == "posts"
+        assert isinstance(prop.prop, CachedProp)
+        assert prop.prop.key.endswith("get_posts")
+
+        with pytest.raises(ValueError):
+            cached(optional(lambda: 1))
+        with pytest.raises(ValueError):
+            cached(scroll([1, 2]), key="rows")
+
+    def test_local_functions_need_a_key(self):
+        """A function defined in a view may capture per-request values"""
+        name = "alice"
+
+        def profile():
+            return {"name": name}
+
+        with pytest.raises(ValueError):
+            cached(profile, ttl=60)
+        assert cached(profile, key=f"profile:{name}").key == "profile:alice"
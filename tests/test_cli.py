@@ -1,11 +1,30 @@
-import subprocess
-from unittest.mock import patch
+import io
+import sys
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 from flask import Flask
 
 from inertia_flask import Inertia
-from inertia_flask.cli import InertiaCommands
+from inertia_flask.cli import VITE_READY, InertiaCommands
+from inertia_flask.supervisor import DevServer, run_parallel
+
+
+def patch_popen(returncode=0, output=""):
+    """Patch subprocess.Popen with a process exiting with ``returncode``"""
+    process = MagicMock()
+    process.stdout = io.StringIO(output)
+    process.wait.return_value = returncode
+    return patch("subprocess.Popen", return_value=process)
+
+
+# Like a package manager, runs the job in a child sharing the output pipe
+SPAWNS_CHILD = """
+import subprocess, sys, time
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+time.sleep(30)
+"""
 
 
 class TestCLI:
@@ -34,7 +53,7 @@ class TestCLI:
 
     def test_vite_build_command(self, app, tmp_path):
         """Test to ensure `flask vite build` is implemented"""
-        with patch("subprocess.run") as mock_run:
+        with patch_popen() as mock_popen:
             # Create a runner and invoke the command
             vite_dir = tmp_path / "react"
             vite_dir.mkdir()
@@ -45,12 +64,14 @@ class TestCLI:
             # Check command executed successfully
             assert result.exit_code == 0
 
-            # Verify subprocess.run was called with correct arguments
-            mock_run.assert_called_once_with(["pnpm", "run", "build"], check=True)
+            # Verify the build ran with correct arguments in the vite dir
+            mock_popen.assert_called_once()
+            assert mock_popen.call_args.args[0] == ["pnpm", "run", "build"]
+            assert mock_popen.call_args.kwargs["cwd"] == str(vite_dir)
 
     def test_vite_install_command(self, app, tmp_path):
         """Test to ensure `flask vite install` is implemented"""
-        with patch("subprocess.run") as mock_run:
+        with patch_popen() as mock_popen:
             vite_dir = tmp_path / "react"
             vite_dir.mkdir()
             app.config["INERTIA_VITE_DIR"] = str(vite_dir)
@@ -58,7 +79,9 @@ class TestCLI:
             result = runner.invoke(args=["vite", "install"])
 
             assert result.exit_code == 0
-            mock_run.assert_called_once_with(["pnpm", "install"], check=True)
+            mock_popen.assert_called_once()
+            assert mock_popen.call_args.args[0] == ["pnpm", "install"]
+            assert mock_popen.call_args.kwargs["cwd"] == str(vite_dir)
 
     def test_package_manager_detection(self, commands, tmp_path):
         """Test package manager detection logic"""
@@ -83,7 +106,171 @@ class TestCLI:
 
     def test_error_handling(self, app):
         """Ensure that is we have no vite dir set, we error"""
-        with patch("subprocess.run", side_effect=subprocess.CalledProcessError(1, [])):
+        with patch_popen(returncode=1):
             runner = app.test_cli_runner()
             result = runner.invoke(args=["vite", "build"])
             assert result.exit_code != 0
+
+    def test_vite_build_skips_unchanged_sources(self, app, tmp_path):
+        """Test that `flask vite build` only rebuilds when sources change"""
+        vite_dir = tmp_path / "react"
+        vite_dir.mkdir()
+        (vite_dir / "pnpm-lock.yaml").touch()
+        (vite_dir / "main.tsx").write_text("one")
+        app.config["INERTIA_VITE_DIR"] = str(vite_dir)
+        runner = app.test_cli_runner()
+        with patch_popen() as mock_run:
+            runner.invoke(args=["vite", "build"])
+            result = runner.invoke(args=["vite", "build"])
+            assert "up to date" in result.output
+            assert mock_run.call_count == 1
+
+            (vite_dir / "main.tsx").write_text("two")
+            runner.invoke(args=["vite", "build"])
+            assert mock_run.call_count == 2
+
+            runner.invoke(args=["vite", "build", "--force"])
+            assert mock_run.call_count == 3
+
+    def test_vite_build_ignores_its_output(self, app, tmp_path):
+        """Test that files written by the build do not invalidate the fingerprint"""
+        vite_dir = tmp_path / "react"
+        vite_dir.mkdir()
+        (vite_dir / "pnpm-lock.yaml").touch()
+        (vite_dir / "main.tsx").write_text("one")
+        app.config["INERTIA_VITE_DIR"] = str(vite_dir)
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(
+            vite_dir / "build" / "manifest" / "manifest.json"
+        )
+        app.config["INERTIA_ASSETS_DIR"] = str(vite_dir / "public" / "build")
+        runner = app.test_cli_runner()
+        with patch_popen() as mock_run:
+            runner.invoke(args=["vite", "build"])
+            (vite_dir / "build" / "manifest" / "manifest.json").write_text("{}")
+            (vite_dir / "public" / "build").mkdir(parents=True)
+            (vite_dir / "public" / "build" / "app-BxF9a2Qz.js").write_text("1")
+            result = runner.invoke(args=["vite", "build"])
+            assert "up to date" in result.output
+            assert mock_run.call_count == 1
+
+    def test_vite_install_skips_unchanged_lockfile(self, app, tmp_path):
+        """Test that `flask vite install` only reinstalls when the lockfile changes"""
+        vite_dir = tmp_path / "react"
+        vite_dir.mkdir()
+        (vite_dir / "pnpm-lock.yaml").write_text("one")
+        app.config["INERTIA_VITE_DIR"] = str(vite_dir)
+        runner = app.test_cli_runner()
+        with patch_popen() as mock_run:
+            runner.invoke(args=["vite", "install"])
+            runner.invoke(args=["vite", "install"])
+            assert mock_run.call_count == 1
+
+            (vite_dir / "pnpm-lock.yaml").write_text("two")
+            runner.invoke(args=["vite", "install"])
+            assert mock_run.call_count == 2
+
+            (vite_dir / "node_modules" / ".inertia-install").unlink()
+            runner.invoke(args=["vite", "install"])
+            assert mock_run.call_count == 3
+
+    def test_vite_build_blueprint_frontends(self, app, tmp_path):
+        """Test that `flask vite build` builds every configured frontend"""
+        for name in ("react", "admin"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "pnpm-lock.yaml").touch()
+        app.config["INERTIA_VITE_DIR"] = str(tmp_path / "react")
+        app.config["ADMIN_INERTIA_VITE_DIR"] = str(tmp_path / "admin")
+        with patch_popen(output="built\n") as mock_popen:
+            result = app.test_cli_runner().invoke(args=["vite", "build"])
+        assert result.exit_code == 0
+        assert sorted(call.kwargs["cwd"] for call in mock_popen.call_args_list) == [
+            str(tmp_path / "admin"),
+            str(tmp_path / "react"),
+        ]
+        assert "[app] build succeeded" in result.output
+        assert "[admin] build succeeded" in result.output
+
+    def test_vite_build_compress(self, app, tmp_path):
+        """Test that `flask vite build --compress` precompresses the build output"""
+        vite_dir = tmp_path / "react"
+        (vite_dir / "dist" / ".vite").mkdir(parents=True)
+        (vite_dir / "pnpm-lock.yaml").touch()
+        (vite_dir / "dist" / "app-BxF9a2Qz.js").write_text("console.log(1);\n" * 100)
+        app.config["INERTIA_VITE_DIR"] = str(vite_dir)
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(
+            vite_dir / "dist" / ".vite" / "manifest.json"
+        )
+        with patch_popen():
+            result = app.test_cli_runner().invoke(args=["vite", "build", "--compress"])
+        assert result.exit_code == 0
+        assert (vite_dir / "dist" / "app-BxF9a2Qz.js.gz").exists()
+        assert "[app] Compressed 1 file(s)" in result.output
+
+    def test_run_parallel_fails_fast(self):
+        """Test that a failing job stops the jobs still running"""
+        results = run_parallel(
+            [
+                ("fail", [sys.executable, "-c", "print('boom'); exit(3)"], None),
+                ("slow", [sys.executable, "-c", SPAWNS_CHILD], None),
+            ],
+            max_workers=2,
+        )
+        assert results["fail"] == 3
+        assert results["slow"] != 0
+
+    def test_run_parallel_missing_command(self):
+        """Test that a command that cannot start fails the run instead of raising"""
+        results = run_parallel(
+            [
+                ("missing", ["inertia-flask-missing-command"], None),
+                ("next", [sys.executable, "-c", "pass"], None),
+            ],
+            max_workers=1,
+        )
+        assert results == {"missing": 127, "next": None}
+
+    def test_dev_server(self, capsys):
+        """Test that the dev server detects readiness and stops every child"""
+        server = DevServer()
+        matches = []
+        server.add(
+            "vite",
+            [
+                sys.executable,
+                "-c",
+                "import time; print('  Local:   http://localhost:5174/', flush=True); "
+                "time.sleep(30)",
+            ],
+            ready=VITE_READY,
+            on_ready=matches.append,
+        )
+        server.add(
+            "flask",
+            [sys.executable, "-c", "import sys, time; time.sleep(0.5); sys.exit(4)"],
+        )
+        assert server.run() == 4
+        assert server.ready == ["vite"]
+        # The hot file gets the origin Vite actually listens on
+        assert [match.group("origin") for match in matches] == ["http://localhost:5174"]
+        output = capsys.readouterr().out
+        assert "[vite]   Local:   http://localhost:5174/" in output
+        assert "[flask] exited with code 4" in output
+
+    def test_dev_server_stops_grandchildren(self):
+        """Test that stopping the dev server does not wait on orphaned children"""
+        server = DevServer()
+        server.add("vite", [sys.executable, "-c", SPAWNS_CHILD])
+        server.add(
+            "flask",
+            [sys.executable, "-c", "import time; time.sleep(0.5)"],
+        )
+        started = time.monotonic()
+        assert server.run() == 0
+        # The grandchild sleeps for 30 seconds if it is left running
+        assert time.monotonic() - started < 20
+
+    def test_flask_run_args(self, commands):
+        """Test that the dev server runs Flask with the reloader"""
+        args = commands._flask_run_args()
+        assert args[:3] == [sys.executable, "-m", "flask"]
+        assert args[-2:] == ["run", "--debug"]
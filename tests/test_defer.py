@@ -27,3 +27,16 @@ class TestDefer(TestInertiaPartial):
         assert json.loads(response.data) == self.inertia_expect_partial(
             app, props=self.expected_deferred_props
         )
+
+    def test_inertia_partial_except(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers.update(
+            {
+                "X-Inertia-Partial-Except": "name",
+                "X-Inertia-Partial-Component": self.component,
+            }
+        )
+        response = test_client.get(self.route, headers=headers)
+        assert json.loads(response.data) == self.inertia_expect_partial(
+            app, props=self.expected_deferred_props
+        )
@@ -0,0 +1,74 @@
+import json
+
+from tests.test_inertia import TestInertia
+
+
+class TestFlash(TestInertia):
+    root = "app"
+    route = "/flash-target"
+    component = "component"
+
+    def test_flash_survives_redirect(self, test_client, app):
+        response = test_client.put("/flash", headers=self.inertia_headers(app))
+        assert response.status_code == 303
+
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data) == self.inertia_expect(
+            app,
+            props={
+                "flash": {"success": ["Saved"]},
+                "errors": {"name": "Name is required"},
+            },
+        )
+
+        # Errors last one render, including the bags that were not sent
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data) == self.inertia_expect(app)
+
+    def test_error_bag(self, test_client, app):
+        test_client.put("/flash", headers=self.inertia_headers(app))
+        headers = self.inertia_headers(app)
+        headers["X-Inertia-Error-Bag"] = "login"
+        response = test_client.get(self.route, headers=headers)
+        props = json.loads(response.data)["props"]
+        assert props["errors"] == {"login": {"email": "Email is invalid"}}
+
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert "errors" not in json.loads(response.data)["props"]
+
+    def test_missing_error_bag(self, test_client, app):
+        test_client.put("/flash", headers=self.inertia_headers(app))
+        headers = self.inertia_headers(app)
+        headers["X-Inertia-Error-Bag"] = "signup"
+        response = test_client.get(self.route, headers=headers)
+        props = json.loads(response.data)["props"]
+        assert props["errors"] == {"name": "Name is required"}
+
+    def test_named_error_bag_without_header(self, test_client, app):
+        test_client.put("/flash-login", headers=self.inertia_headers(app))
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        props = json.loads(response.data)["props"]
+        assert props["errors"] == {"login": {"email": "Email is invalid"}}
+
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data) == self.inertia_expect(app)
+
+    def test_flash_kept_on_partial_reload(self, test_client, app):
+        test_client.put("/flash", headers=self.inertia_headers(app))
+        headers = self.inertia_headers(app)
+        headers.update(
+            {
+                "X-Inertia-Partial-Data": "other",
+                "X-Inertia-Partial-Component": self.component,
+            }
+        )
+        response = test_client.get(self.route, headers=headers)
+        assert json.loads(response.data)["props"] == {}
+
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data)["props"]["flash"] == {"success": ["Saved"]}
+
+    def test_no_flash_props_when_empty(self, test_client, app):
+        response = test_client.get(self.route)
+        assert self.parse_initial_response(response) == self.inertia_expect(app)
+        assert "Set-Cookie" not in response.headers
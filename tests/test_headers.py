@@ -0,0 +1,31 @@
+from inertia_flask.headers import InertiaHeaders, inertia_headers
+
+
+class TestHeaders:
+    """Tests for the parsed Inertia request headers"""
+
+    def test_parse(self):
+        headers = InertiaHeaders.parse(
+            {
+                "X-Inertia": "true",
+                "X-Inertia-Version": "abc",
+                "X-Inertia-Partial-Component": "component",
+                "X-Inertia-Partial-Data": "name,email",
+                "X-Inertia-Reset": "items",
+            }
+        )
+        assert headers.inertia
+        assert headers.version == "abc"
+        assert headers.partial_data == {"name", "email"}
+        assert headers.reset == {"items"}
+        assert headers.except_once == frozenset()
+        assert headers.error_bag is None
+        assert headers.is_partial_render("component")
+        assert not headers.is_partial_render("other")
+        assert headers.is_partial_key("name")
+        assert not headers.is_partial_key("items")
+
+    def test_parsed_once_per_request(self, app):
+        with app.test_request_context("/", headers={"X-Inertia": "true"}):
+            assert inertia_headers() is inertia_headers()
+            assert inertia_headers().inertia
@@ -51,3 +51,26 @@ class TestClearDecorator(TestInertia):
         assert self.parse_initial_response(response) == self.inertia_expect(
             app, clear_history=True
         )
+
+
+class TestClearRedirect(TestInertia):
+    root = "app"
+    component = "component"
+    route = "/clear-target"
+
+    def test_clear_survives_redirect(self, app, test_client):
+        response = test_client.get("/clear-redirect")
+        assert response.status_code == 302
+        response = test_client.get(self.route)
+        assert self.parse_initial_response(response) == self.inertia_expect(
+            app, clear_history=True
+        )
+        response = test_client.get(self.route)
+        assert self.parse_initial_response(response) == self.inertia_expect(app)
+
+    def test_render_does_not_touch_session(self, app, test_client):
+        response = test_client.get("/clear-function")
+        assert "Set-Cookie" not in response.headers
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert "Set-Cookie" not in response.headers
+        assert "Cookie" not in response.headers.get("Vary", "")
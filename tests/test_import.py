@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+LAZY_MODULES = ("requests", "inertia_flask.cli", "inertia_flask.supervisor")
+# Share of Flask's own import time ``import inertia_flask`` may add. Relative to
+# Flask, so slow or loaded machines do not fail it; about 0.2 at the moment
+IMPORT_BUDGET = 0.5
+
+
+class TestImport:
+    """Guards the cold-start cost of importing the package"""
+
+    def import_times(self):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import flask, inertia_flask"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+        return times
+
+    def test_import_budget(self):
+        times = self.import_times()
+        assert times["inertia_flask"] < times["flask"] * IMPORT_BUDGET
+
+    def test_heavy_modules_load_lazily(self):
+        times = self.import_times()
+        for module in LAZY_MODULES:
+            assert module not in times
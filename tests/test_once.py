@@ -0,0 +1,46 @@
+import json
+
+from tests.test_inertia import TestInertia
+
+
+class TestOnce(TestInertia):
+    root = "app"
+    route = "/once"
+    component = "component"
+    expected_props = {
+        "name": "Alice",
+        "locale": {"hello": "Hello"},
+        "permissions": ["read"],
+    }
+
+    def test_inertia_initial_render(self, test_client, app):
+        response = test_client.get(self.route)
+        assert response.status_code == 200
+        page = self.parse_initial_response(response)
+        assert page["props"] == self.expected_props
+        assert page["onceProps"]["locale"] == {"prop": "locale", "expiresAt": None}
+        assert page["onceProps"]["perms"]["prop"] == "permissions"
+        assert page["onceProps"]["perms"]["expiresAt"] is not None
+
+    def test_inertia_once_skipped(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers["X-Inertia-Except-Once-Props"] = "locale,perms"
+        response = test_client.get(self.route, headers=headers)
+        page = json.loads(response.data)
+        assert page["props"] == {"name": "Alice"}
+        assert set(page["onceProps"]) == {"locale", "perms"}
+        assert app.config.get("ONCE_CALLS", 0) == 0
+
+    def test_inertia_once_partial(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers.update(
+            {
+                "X-Inertia-Except-Once-Props": "locale",
+                "X-Inertia-Partial-Data": "locale",
+                "X-Inertia-Partial-Component": self.component,
+            }
+        )
+        response = test_client.get(self.route, headers=headers)
+        page = json.loads(response.data)
+        assert page["props"] == {"locale": {"hello": "Hello"}}
+        assert set(page["onceProps"]) == {"locale"}
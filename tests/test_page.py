@@ -1,5 +1,6 @@
 import json
 
+from inertia_flask import inertia
 from tests.test_inertia import TestInertia
 
 
@@ -26,6 +27,22 @@ class TestPage(TestInertia):
         response = test_client.get(self.route, headers=headers)
         assert response.status_code == 409
 
+    def test_version_mismatch_skips_view(self, app):
+        """Test stale GET visits are answered before the view runs"""
+        calls = []
+
+        @app.route("/stale")
+        @inertia("component")
+        def stale():
+            calls.append(True)
+            return {}
+
+        headers = {"X-Inertia": "true", "X-Inertia-Version": "wrong-version"}
+        response = app.test_client().get("/stale", headers=headers)
+        assert response.status_code == 409
+        assert response.headers["X-Inertia-Location"] == "http://localhost/stale"
+        assert calls == []
+
 
 class TestShorthand(TestInertia):
     root = "app"
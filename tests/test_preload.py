@@ -0,0 +1,120 @@
+import json
+from unittest.mock import MagicMock
+
+from flask import request
+
+from inertia_flask import render
+from tests.test_inertia import TestInertia
+
+MANIFEST = {
+    "src/main.tsx": {
+        "file": "assets/main-abc123.js",
+        "isEntry": True,
+        "imports": ["_vendor.js"],
+        "css": ["assets/main-abc123.css"],
+    },
+    "src/admin.tsx": {"file": "assets/admin-fed321.js", "isEntry": True},
+    "_vendor.js": {"file": "assets/vendor-def456.js"},
+    "src/Pages/component.tsx": {
+        "file": "assets/component-789.js",
+        "isDynamicEntry": True,
+        "imports": ["_vendor.js"],
+        "css": ["assets/component-789.css"],
+    },
+}
+SSR_MANIFEST = {
+    "src/Pages/Eager.tsx": [
+        "/static/assets/main-abc123.js",
+        "/static/assets/eager.css",
+    ],
+}
+
+
+class TestPreload(TestInertia):
+    """Tests for Link preload headers and Early Hints on first loads"""
+
+    root = "app"
+    route = "/"
+    component = "component"
+
+    def configure(self, app, tmp_path):
+        (tmp_path / "manifest.json").write_text(json.dumps(MANIFEST))
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(tmp_path / "manifest.json")
+        app.config["INERTIA_VITE_ENTRY"] = "src/main.tsx"
+        app.config["INERTIA_PRELOAD_HEADERS"] = True
+
+    def test_preload_headers(self, test_client, app, tmp_path):
+        self.configure(app, tmp_path)
+        response = test_client.get(self.route)
+        assert response.headers["Link"].split(", ") == [
+            "</static/assets/main-abc123.css>; rel=preload; as=style",
+            "</static/assets/main-abc123.js>; rel=modulepreload",
+            "</static/assets/vendor-def456.js>; rel=modulepreload",
+            "</static/assets/component-789.css>; rel=preload; as=style",
+            "</static/assets/component-789.js>; rel=modulepreload",
+        ]
+
+    def test_no_preload_headers_for_inertia_visits(self, test_client, app, tmp_path):
+        self.configure(app, tmp_path)
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert "Link" not in response.headers
+
+    def test_no_preload_headers_by_default(self, test_client, app, tmp_path):
+        self.configure(app, tmp_path)
+        app.config["INERTIA_PRELOAD_HEADERS"] = False
+        assert "Link" not in test_client.get(self.route).headers
+
+    def test_early_hints(self, test_client, app, tmp_path):
+        self.configure(app, tmp_path)
+        app.config["INERTIA_EARLY_HINTS"] = True
+        early_hints = MagicMock()
+        test_client.get(self.route, environ_overrides={"wsgi.early_hints": early_hints})
+        early_hints.assert_called_once()
+        assert (
+            "Link",
+            "</static/assets/main-abc123.js>; rel=modulepreload",
+        ) in early_hints.call_args.args[0]
+
+    def test_component_preloads(self, app, tmp_path):
+        self.configure(app, tmp_path)
+        (tmp_path / "ssr-manifest.json").write_text(json.dumps(SSR_MANIFEST))
+        app.config["INERTIA_VITE_SSR_MANIFEST_PATH"] = str(
+            tmp_path / "ssr-manifest.json"
+        )
+        inertia = app.extensions["inertia"]
+        with app.test_request_context(self.route):
+            assert inertia.preload_urls("component") == [
+                "/static/assets/component-789.css",
+                "/static/assets/component-789.js",
+                "/static/assets/vendor-def456.js",
+            ]
+            # Pages bundled into another chunk are found in the SSR manifest
+            assert inertia.preload_urls("Eager") == SSR_MANIFEST["src/Pages/Eager.tsx"]
+            assert inertia.preload_urls("Missing") == []
+
+    def test_entry_preloads(self, app, tmp_path):
+        self.configure(app, tmp_path)
+        inertia = app.extensions["inertia"]
+        with app.test_request_context(self.route):
+            assert "/static/assets/admin-fed321.js" not in inertia.preload_urls()
+
+        # Which of several entries the layout loads is unknown
+        app.config["INERTIA_VITE_ENTRY"] = None
+        with app.test_request_context(self.route):
+            assert inertia.preload_urls() == []
+
+    def test_urls_built_per_request(self, app, tmp_path):
+        self.configure(app, tmp_path)
+        inertia = app.extensions["inertia"]
+        with app.test_request_context(self.route):
+            inertia.preload_urls("component")
+        with app.test_request_context(self.route, base_url="http://localhost/app"):
+            assert inertia.preload_urls("component")[0] == (
+                "/app/static/assets/component-789.css"
+            )
+
+    def test_template_data_overrides_preload(self, app, tmp_path):
+        self.configure(app, tmp_path)
+        with app.test_request_context(self.route):
+            response = render(request, "component", template_data={"preload": ""})
+        assert response.status_code == 200
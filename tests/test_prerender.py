@@ -0,0 +1,83 @@
+import json
+
+from tests.test_inertia import TestInertia
+
+
+class TestPrerender(TestInertia):
+    root = "app"
+    route = "/prerender"
+    component = "component"
+    expected_props = {"name": "Alice"}
+
+    def prerender(self, app, tmp_path):
+        app.config["INERTIA_PRERENDER_DIR"] = str(tmp_path)
+        result = app.test_cli_runner().invoke(args=["inertia", "prerender"])
+        assert result.exit_code == 0
+        with open(tmp_path / "manifest.json", encoding="utf-8") as content:
+            return json.load(content)
+
+    def test_prerender_command(self, app, tmp_path):
+        manifest = self.prerender(app, tmp_path)
+        assert set(manifest) == {"/prerender", "/shorthand"}
+        entry = manifest[self.route]
+        assert entry["version"] == self.get_asset_version(app)
+        page = json.loads((tmp_path / entry["json"]).read_text())
+        assert page == self.inertia_expect(app)
+
+    def test_prerender_serve(self, app, test_client, tmp_path):
+        manifest = self.prerender(app, tmp_path)
+        (tmp_path / manifest[self.route]["json"]).write_text('{"served": true}')
+        app.config["INERTIA_PRERENDER_SERVE"] = True
+
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data) == {"served": True}
+        assert response.headers["X-Inertia"] == "true"
+
+        response = test_client.get(self.route)
+        assert self.parse_initial_response(response) == self.inertia_expect(app)
+
+    def test_prerender_stale_version(self, app, test_client, tmp_path):
+        manifest = self.prerender(app, tmp_path)
+        manifest[self.route]["version"] = "old-version"
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+        (tmp_path / manifest[self.route]["json"]).write_text('{"served": true}')
+        app.config["INERTIA_PRERENDER_SERVE"] = True
+
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data) == self.inertia_expect(app)
+
+    def test_prerender_skipped_with_pending_state(self, app, test_client, tmp_path):
+        manifest = self.prerender(app, tmp_path)
+        (tmp_path / manifest[self.route]["json"]).write_text('{"served": true}')
+        app.config["INERTIA_PRERENDER_SERVE"] = True
+
+        headers = self.inertia_headers(app)
+        headers["X-Inertia-Reset"] = "name"
+        response = test_client.get(self.route, headers=headers)
+        assert json.loads(response.data) != {"served": True}
+
+        with test_client.session_transaction() as session:
+            session["_inertia_flash"] = {"flash": {"success": ["Saved"]}}
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert json.loads(response.data)["props"]["flash"] == {"success": ["Saved"]}
+
+    def test_prerender_cleanup(self, app, tmp_path):
+        manifest = self.prerender(app, tmp_path)
+        (tmp_path / "unrelated.json").write_text("{}")
+        stale = {
+            "/old": {
+                "endpoint": "old",
+                "version": "v1",
+                "html": "old.v1.html",
+                "json": "old.v1.json",
+            }
+        }
+        (tmp_path / "old.v1.html").write_text("")
+        (tmp_path / "old.v1.json").write_text("")
+        (tmp_path / "manifest.json").write_text(json.dumps({**manifest, **stale}))
+
+        assert self.prerender(app, tmp_path) == manifest
+        assert (tmp_path / "unrelated.json").exists()
+        assert not (tmp_path / "old.v1.html").exists()
+        assert not (tmp_path / "old.v1.json").exists()
+        assert (tmp_path / manifest[self.route]["html"]).exists()
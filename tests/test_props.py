@@ -0,0 +1,35 @@
+from inertia_flask import defer, merge, once, optional, scroll
+from inertia_flask.prop_classes import (
+    PROP_DEFERRED,
+    PROP_IGNORE_ON_FIRST_LOAD,
+    PROP_MERGEABLE,
+    PROP_ONCE,
+    PROP_SCROLL,
+    IgnoreOnFirstLoadProp,
+    MergeableProp,
+    prop_flags,
+)
+
+
+class TestProps:
+    """Tests for the prop wrapper classes"""
+
+    def test_props_are_slotted(self):
+        for prop in (optional(1), defer(1), merge(1), scroll([1]), once(1)):
+            assert not hasattr(prop, "__dict__")
+
+    def test_prop_flags(self):
+        assert prop_flags({"plain": "value"}) == 0
+        assert prop_flags(optional(1)) == PROP_IGNORE_ON_FIRST_LOAD
+        assert prop_flags(defer(1)) & PROP_DEFERRED
+        assert prop_flags(scroll([1])) == PROP_MERGEABLE | PROP_SCROLL
+        assert prop_flags(once(1)) == PROP_ONCE
+        assert isinstance(defer(1), MergeableProp)
+
+    def test_custom_props_keep_their_behaviour(self):
+        class Custom(MergeableProp, IgnoreOnFirstLoadProp):
+            def __call__(self):
+                return [1]
+
+        assert prop_flags(Custom()) == PROP_MERGEABLE | PROP_IGNORE_ON_FIRST_LOAD
+        assert Custom().should_merge()
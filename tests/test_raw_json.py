@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from inertia_flask import raw_json
+from inertia_flask.helpers import dumps_json, iter_json
+from inertia_flask.utils import InertiaJsonEncoder
+from tests.test_inertia import TestInertia
+
+
+class TestRawJson(TestInertia):
+    root = "app"
+    route = "/raw-json"
+    component = "component"
+    expected_props = {"name": "Alice", "posts": [{"id": 1, "title": "Hello"}]}
+
+    def test_inertia_initial_render(self, test_client, app):
+        response = test_client.get(self.route)
+        page = self.parse_initial_response(response)
+        assert page["props"] == self.expected_props
+
+    def test_inertia_request(self, test_client, app):
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        # Spliced verbatim, keeping the original formatting
+        assert b'"posts": [{"id": 1, "title": "Hello"}]' in response.data
+        assert json.loads(response.data)["props"] == self.expected_props
+
+    def test_deferred(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers.update(
+            {
+                "X-Inertia-Partial-Data": "user",
+                "X-Inertia-Partial-Component": self.component,
+            }
+        )
+        response = test_client.get(self.route, headers=headers)
+        assert json.loads(response.data)["props"] == {"user": {"id": 2}}
+
+    def test_serializers(self):
+        value = {"raw": raw_json("[1,2]"), "text": "[1,2]", "rows": [3]}
+        expected = {"raw": [1, 2], "text": "[1,2]", "rows": [3]}
+        assert json.loads(dumps_json(value, InertiaJsonEncoder)) == expected
+        encoder = InertiaJsonEncoder(default=str)
+        value["rows"] = iter([3])
+        assert json.loads("".join(iter_json(value, encoder))) == expected
+        assert dumps_json({"a": "b"}, InertiaJsonEncoder) == '{"a": "b"}'
+
+    def test_validated_in_debug(self, app):
+        with app.app_context():
+            raw_json("{invalid")
+            app.config["DEBUG"] = True
+            with pytest.raises(ValueError):
+                raw_json("{invalid")
+        with pytest.raises(TypeError):
+            raw_json({"id": 1})
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from inertia_flask.routes import InertiaRoute
+
+
+class TestRoutes:
+    """Tests for the per-endpoint Inertia route registry"""
+
+    def test_registry(self, app):
+        with app.app_context():
+            routes = app.extensions["inertia"].routes()
+        route = routes["encrypt_decorator"]
+        assert isinstance(route, InertiaRoute)
+        assert route.rules == ("/encrypt-decorator",)
+        assert route.component == "component"
+        assert route.encrypt is True
+        assert route.template == "base.html"
+        assert routes["stream_page"].stream is True
+        assert routes["prerender_page"].prerender is True
+        assert routes["component"].rules == ("/shorthand",)
+        assert "clear_redirect" not in routes
+
+    def test_registry_blueprint_template(self, bp):
+        with bp.app_context():
+            routes = bp.extensions["inertia"].routes()
+        assert routes["bp.bp_page"].template == "blueprint.html"
+
+    def test_routes_command(self, app):
+        result = app.test_cli_runner().invoke(args=["inertia", "routes"])
+        assert result.exit_code == 0
+        assert "/encrypt-decorator" in result.output
+        assert "encrypt" in result.output
+
+    def test_config_read_per_request(self, app, test_client):
+        """Settings that may change at runtime are not frozen in the registry"""
+        inertia = app.extensions["inertia"]
+        app.config["INERTIA_SSR_ENABLED"] = True
+        app.config["INERTIA_SSR_TEMPLATE"] = "base.html"
+        app.config["DEBUG"] = False
+        rendered = {"body": "<div id='app'>SSR</div>"}
+        with patch.object(inertia.ssr, "render", return_value=rendered) as mock_render:
+            test_client.get("/")
+            assert mock_render.call_count == 1
+
+            # e.g. `flask inertia --debug` after the registry was built
+            app.config["DEBUG"] = True
+            test_client.get("/")
+            assert mock_render.call_count == 1
+
+        app.config["INERTIA_STREAM_JSON"] = True
+        with patch(
+            "inertia_flask.responses.iter_json_chunks", return_value=iter(["{}"])
+        ) as mock_stream:
+            test_client.get("/", headers={"X-Inertia": "true"})
+        mock_stream.assert_called_once()
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from inertia_flask import merge
+from inertia_flask.helpers import fetch_page
+from tests.test_inertia import TestInertia
+
+
+class TestScroll(TestInertia):
+    root = "app"
+    route = "/scroll"
+    component = "component"
+
+    def test_inertia_first_page(self, test_client, app):
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        page = json.loads(response.data)
+        assert page["props"]["users"]["data"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert page["mergeProps"] == ["users.data"]
+        assert page["prependProps"] == ["tags"]
+        assert page["deepMergeProps"] == ["settings"]
+        assert page["matchPropsOn"] == ["users.data.id"]
+        assert page["scrollProps"]["users"] == {
+            "pageName": "page",
+            "previousPage": None,
+            "nextPage": 2,
+            "currentPage": 1,
+            "reset": False,
+        }
+
+    def test_inertia_last_page(self, test_client, app):
+        response = test_client.get(
+            f"{self.route}?page=3", headers=self.inertia_headers(app)
+        )
+        page = json.loads(response.data)
+        assert page["props"]["users"]["data"] == [{"id": 7}]
+        assert page["scrollProps"]["users"]["previousPage"] == 2
+        assert page["scrollProps"]["users"]["nextPage"] is None
+
+    def test_inertia_prepend_intent(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers["X-Inertia-Infinite-Scroll-Merge-Intent"] = "prepend"
+        response = test_client.get(f"{self.route}?page=2", headers=headers)
+        page = json.loads(response.data)
+        assert page["prependProps"] == ["users.data", "tags"]
+        assert "mergeProps" not in page
+
+    def test_inertia_reset(self, test_client, app):
+        headers = self.inertia_headers(app)
+        headers["X-Inertia-Reset"] = "users"
+        response = test_client.get(self.route, headers=headers)
+        page = json.loads(response.data)
+        assert "mergeProps" not in page
+        assert page["scrollProps"]["users"]["reset"] is True
+
+
+class TestFetchPage:
+    """Tests for fetching a single page of a scroll prop"""
+
+    def test_sources(self):
+        rows = list(range(1, 8))
+        assert fetch_page(rows, 2, 3) == ([4, 5, 6], True)
+        assert fetch_page(iter(rows), 3, 3) == ([7], False)
+        # Callables are lazy values, like every other prop
+        assert fetch_page(lambda: rows, 1, 3) == ([1, 2, 3], True)
+
+    def test_paginate(self):
+        calls = []
+
+        def paginate(offset, limit):
+            calls.append((offset, limit))
+            return list(range(offset, offset + limit))
+
+        assert fetch_page(None, 2, 3, paginate=paginate) == ([3, 4, 5], True)
+        assert calls == [(3, 4)]
+
+    def test_merge_prepend_and_deep(self):
+        with pytest.raises(ValueError):
+            merge([1], prepend=True, deep=True)
@@ -0,0 +1,112 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from inertia_flask.ssr import SSRClient, ssr_urls
+from inertia_flask.supervisor import Supervisor
+
+
+class TestSSR:
+    """Tests for the SSR client and its worker pool"""
+
+    def test_ssr_urls(self):
+        assert ssr_urls("http://localhost:13714") == ("http://localhost:13714",)
+        assert ssr_urls("http://localhost:13714", 3) == (
+            "http://localhost:13714",
+            "http://localhost:13715",
+            "http://localhost:13716",
+        )
+
+    def test_least_outstanding_requests(self):
+        client = SSRClient()
+        urls = ("http://a", "http://b")
+        busy = client._acquire(urls)
+        # While one render is in flight, the others go to the idle server
+        for _ in range(3):
+            idle = client._acquire(urls)
+            assert idle != busy
+            client._release(idle)
+        client._release(busy)
+
+    def test_render_retries_refused_connection(self):
+        client = SSRClient()
+        response = MagicMock()
+        response.json.return_value = {"body": "<div></div>"}
+        with patch.object(
+            client.session,
+            "post",
+            side_effect=[requests.exceptions.ConnectionError(), response],
+        ) as mock_post:
+            assert client.render(("http://a", "http://b"), "{}") == {
+                "body": "<div></div>"
+            }
+        targets = [call.args[0] for call in mock_post.call_args_list]
+        assert sorted(targets) == ["http://a/render", "http://b/render"]
+        assert client._outstanding == {"http://a": 0, "http://b": 0}
+
+    def test_render_single_server_raises(self):
+        client = SSRClient()
+        with patch.object(
+            client.session, "post", side_effect=requests.exceptions.ConnectionError()
+        ):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client.render("http://a", "{}")
+
+    def test_supervisor_restarts_crashed_process(self):
+        supervisor = Supervisor(restart_delay=0)
+        supervisor.add("worker", [sys.executable, "-c", "pass"])
+        supervisor.start()
+        first = supervisor.children["worker"]["process"]
+        first.wait()
+        try:
+            restarted = []
+            deadline = time.monotonic() + 5
+            while not restarted and time.monotonic() < deadline:
+                restarted = supervisor.poll()
+            assert restarted == ["worker"]
+            assert supervisor.children["worker"]["process"] is not first
+        finally:
+            supervisor.stop()
+
+    @pytest.mark.skipif(not hasattr(os, "killpg"), reason="POSIX signals")
+    def test_supervisor_stops_workers_on_sigterm(self, tmp_path):
+        pid_file = tmp_path / "worker.pid"
+        worker = (
+            "import os, time; "
+            f"open({str(pid_file)!r}, 'w').write(str(os.getpid())); "
+            "time.sleep(30)"
+        )
+        supervisor = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from inertia_flask.supervisor import Supervisor; "
+                "supervisor = Supervisor(); "
+                "supervisor.add('worker', [sys.executable, '-c', sys.argv[1]]); "
+                "supervisor.run()",
+                worker,
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while not pid_file.exists() or not pid_file.read_text():
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+            supervisor.send_signal(signal.SIGTERM)
+            supervisor.wait(timeout=10)
+            with pytest.raises(ProcessLookupError):
+                os.kill(int(pid_file.read_text()), 0)
+        finally:
+            supervisor.kill()
+
+    def test_ssr_command_without_bundle(self, app):
+        result = app.test_cli_runner().invoke(args=["inertia", "ssr"])
+        assert result.exit_code != 0
+        assert "No SSR bundle found" in result.output
@@ -0,0 +1,28 @@
+import json
+
+from tests.test_inertia import TestInertia
+
+
+class TestStream(TestInertia):
+    root = "app"
+    route = "/stream"
+    component = "component"
+    expected_props = {
+        "name": "Alice",
+        "rows": [{"id": 0, "1": True}, {"id": 1, "1": True}, {"id": 2, "1": True}],
+        "numbers": [1],
+    }
+
+    def test_inertia_initial_render(self, test_client, app):
+        response = test_client.get(self.route)
+        assert response.status_code == 200
+        page = self.parse_initial_response(response)
+        assert page["props"] == self.expected_props
+
+    def test_inertia_streamed_page_data(self, test_client, app):
+        response = test_client.get(self.route, headers=self.inertia_headers(app))
+        assert response.is_streamed
+        assert response.headers["Content-Type"] == "application/json"
+        expected = self.inertia_expect(app)
+        expected["mergeProps"] = ["numbers"]
+        assert json.loads(response.data) == expected
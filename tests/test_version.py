@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from flask import Flask
+
+from inertia_flask import Inertia, _get_asset_version, inertia
+
+
+class TestVersion:
+    """Tests for the asset version strategies"""
+
+    def get_version(self, app):
+        with app.test_request_context("/"):
+            return _get_asset_version()
+
+    def write_manifest(self, app, tmp_path, file):
+        manifest = {"src/main.tsx": {"file": file, "css": ["assets/main.css"]}}
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(tmp_path / "manifest.json")
+        app.config["INERTIA_VERSION_STRATEGY"] = "manifest"
+
+    def test_manifest_version(self, app, tmp_path):
+        self.write_manifest(app, tmp_path, "assets/main-abc.js")
+        version = self.get_version(app)
+        assert version
+        app.extensions["inertia"].state(app).asset_versions.clear()
+        assert self.get_version(app) == version
+
+        self.write_manifest(app, tmp_path, "assets/main-d3f4.js")
+        app.extensions["inertia"].state(app).asset_versions.clear()
+        assert self.get_version(app) != version
+
+    def test_version_is_cached(self, app, tmp_path):
+        self.write_manifest(app, tmp_path, "assets/main-abc.js")
+        version = self.get_version(app)
+        self.write_manifest(app, tmp_path, "assets/main-d3f4.js")
+        assert self.get_version(app) == version
+
+    def test_file_version(self, app, tmp_path):
+        (tmp_path / "version.txt").write_text("build-42\n")
+        app.config["INERTIA_VERSION_STRATEGY"] = "file"
+        app.config["INERTIA_VERSION_FILE"] = str(tmp_path / "version.txt")
+        assert self.get_version(app) == "build-42"
+
+    def test_callable_version(self, app):
+        app.config["INERTIA_VERSION"] = lambda blueprint: f"v1-{blueprint}"
+        assert self.get_version(app) == "v1-None"
+
+    def test_unknown_strategy(self, app):
+        app.config["INERTIA_VERSION_STRATEGY"] = "unknown"
+        with pytest.raises(ValueError):
+            self.get_version(app)
+
+    def test_version_mismatch(self, app, test_client):
+        app.config["INERTIA_VERSION"] = "v2"
+        headers = {"X-Inertia": "true", "X-Inertia-Version": "v1"}
+        assert test_client.get("/", headers=headers).status_code == 409
+        headers["X-Inertia-Version"] = "v2"
+        assert test_client.get("/", headers=headers).status_code == 200
+
+    def test_extension_shared_by_apps(self):
+        """State computed for one app is not served to another (app factories)"""
+        extension = Inertia()
+        apps = []
+        for version in ("one", "two"):
+            app = Flask(__name__)
+            app.config["INERTIA_VERSION"] = version
+            app.add_url_rule(f"/{version}", version, inertia(version)(dict))
+            extension.init_app(app)
+            apps.append(app)
+
+        for app, version in zip(apps, ("one", "two")):
+            assert self.get_version(app) == version
+            with app.app_context():
+                assert list(extension.routes()) == [version]
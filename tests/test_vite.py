@@ -0,0 +1,96 @@
+import socket
+from unittest.mock import patch
+
+from inertia_flask.vite import ViteDevProbe
+
+
+class TestViteDev:
+    """Tests for detecting the Vite dev server"""
+
+    def test_probe(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            port = server.getsockname()[1]
+            assert ViteDevProbe.probe(f"http://127.0.0.1:{port}")
+        assert not ViteDevProbe.probe(f"http://127.0.0.1:{port}")
+
+    def test_without_hot_file(self, tmp_path):
+        with patch.object(ViteDevProbe, "probe") as mock_probe:
+            assert ViteDevProbe().origin(str(tmp_path / "hot")) is None
+        mock_probe.assert_not_called()
+
+    def test_configured_origin_without_hot_file(self, tmp_path):
+        """A Vite server started without ``flask vite dev`` is still detected"""
+        probe = ViteDevProbe()
+        hot_file = str(tmp_path / "hot")
+        with patch.object(ViteDevProbe, "probe", return_value=True) as mock_probe:
+            for _ in range(3):
+                assert probe.origin(hot_file, "http://localhost:5173") == (
+                    "http://localhost:5173"
+                )
+        mock_probe.assert_called_once_with("http://localhost:5173", 0.2)
+
+        with (
+            patch.object(ViteDevProbe, "probe", return_value=False),
+            patch("inertia_flask.vite.threading.Thread") as mock_thread,
+            patch("time.monotonic", return_value=float("inf")),
+        ):
+            assert probe.is_running(hot_file, "http://localhost:5173")
+            mock_thread.call_args.kwargs["target"]()
+            assert not probe.is_running(hot_file, "http://localhost:5173")
+
+    def test_origin_from_hot_file(self, tmp_path):
+        probe = ViteDevProbe()
+        hot_file = tmp_path / "hot"
+        hot_file.write_text("http://localhost:5174\n")
+        with patch.object(ViteDevProbe, "probe", return_value=True) as mock_probe:
+            for _ in range(3):
+                assert probe.origin(str(hot_file)) == "http://localhost:5174"
+        # Probed once, when the hot file appeared
+        mock_probe.assert_called_once_with("http://localhost:5174", 0.2)
+
+    def test_stale_hot_file(self, tmp_path):
+        """A hot file left by a killed dev server is re-checked in the background"""
+        probe = ViteDevProbe()
+        hot_file = tmp_path / "hot"
+        hot_file.write_text("http://localhost:5173")
+        with patch.object(ViteDevProbe, "probe", return_value=True):
+            assert probe.is_running(str(hot_file))
+
+        with (
+            patch.object(ViteDevProbe, "probe", return_value=False),
+            patch("inertia_flask.vite.threading.Thread") as mock_thread,
+            patch("time.monotonic", return_value=float("inf")),
+        ):
+            # The request is answered from the last result
+            assert probe.is_running(str(hot_file))
+            mock_thread.call_args.kwargs["target"]()
+            assert not probe.is_running(str(hot_file))
+
+    def test_auto_mode(self, app, tmp_path):
+        app.config["INERTIA_VITE_DEV"] = "auto"
+        inertia = app.extensions["inertia"]
+        with app.test_request_context("/"):
+            app.config["DEBUG"] = True
+            with patch.object(inertia, "vite_dev_running", return_value=True):
+                assert inertia.vite_processor()["vite_dev_server_running"]
+            with patch.object(inertia, "vite_dev_running", return_value=False):
+                assert not inertia.vite_processor()["vite_dev_server_running"]
+
+            # The hot file's origin is only used when detecting the server
+            (tmp_path / "hot").write_text("http://localhost:5174")
+            app.config["INERTIA_VITE_DIR"] = str(tmp_path)
+            with patch.object(ViteDevProbe, "probe", return_value=True):
+                asset = inertia.vite_processor()["vite_asset"]
+                assert asset("src/main.tsx") == "http://localhost:5174/src/main.tsx"
+                app.config["INERTIA_VITE_DEV"] = True
+                asset = inertia.vite_processor()["vite_asset"]
+                assert asset("src/main.tsx") == "http://localhost:5173/src/main.tsx"
+            app.config["INERTIA_VITE_DEV"] = "auto"
+
+            # Production never probes for a dev server
+            app.config["DEBUG"] = False
+            with patch.object(inertia, "vite_dev_running") as mock_running:
+                assert not inertia.vite_processor()["vite_dev_server_running"]
+            mock_running.assert_not_called()
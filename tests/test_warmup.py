@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+from unittest.mock import patch
+
+from inertia_flask.artifacts import SharedArtifacts
+from inertia_flask.version import compute_asset_version, get_asset_version
+
+
+class TestWarmup:
+    """Tests for warming up the extension before serving requests"""
+
+    def test_warmup(self, app, tmp_path):
+        manifest = {"src/main.tsx": {"file": "assets/main-abc123.js"}}
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(tmp_path / "manifest.json")
+        inertia = app.extensions["inertia"]
+
+        summary = inertia.warmup(app)
+
+        assert summary["templates"] == ["base.html"]
+        assert summary["manifest"] is True
+        assert summary["ssr"] is None
+        with app.app_context():
+            assert summary["versions"][None] == compute_asset_version()
+            assert inertia.state(app).asset_versions[None] == summary["versions"][None]
+            assert inertia.get_manifest() == manifest
+
+    def test_warmup_ssr(self, app):
+        app.config["INERTIA_SSR_ENABLED"] = True
+        inertia = app.extensions["inertia"]
+        with patch.object(inertia.ssr, "warmup", return_value=True) as mock_warmup:
+            summary = inertia.warmup(app)
+        mock_warmup.assert_called_once_with((app.config["INERTIA_SSR_URL"],))
+        assert summary["ssr"] is True
+
+    def test_warmup_command(self, app):
+        result = app.test_cli_runner().invoke(args=["inertia", "warmup"])
+        assert result.exit_code == 0
+        assert "Compiled template base.html" in result.output
+
+    def test_warmup_shared_artifacts(self, app, tmp_path):
+        manifest = {"src/main.tsx": {"file": "assets/main-abc123.js"}}
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+        app.config["INERTIA_VITE_MANIFEST_PATH"] = str(tmp_path / "manifest.json")
+        app.config["INERTIA_CACHE_FILE"] = str(tmp_path / "inertia-cache.json")
+        inertia = app.extensions["inertia"]
+
+        summary = inertia.warmup(app)
+        assert summary["artifacts"] == app.config["INERTIA_CACHE_FILE"]
+        stored = json.loads((tmp_path / "inertia-cache.json").read_text())
+        assert stored["versions"][""] == summary["versions"][None]
+        assert stored["manifests"] == {
+            app.config["INERTIA_VITE_MANIFEST_PATH"]: manifest
+        }
+
+        # A worker that computed nothing itself reads the shared file
+        inertia.state(app).asset_versions.clear()
+        (tmp_path / "manifest.json").unlink()
+        stored["versions"][""] = "deployed"
+        (tmp_path / "inertia-cache.json").write_text(json.dumps(stored))
+        with app.app_context():
+            assert get_asset_version() == "deployed"
+            assert inertia.get_manifest() == manifest
+
+        # A manifest rebuilt after the warmup wins over the stored one, along
+        # with the version computed from it
+        rebuilt = {"src/main.tsx": {"file": "assets/main-def456.js"}}
+        (tmp_path / "manifest.json").write_text(json.dumps(rebuilt))
+        cache_mtime = os.stat(tmp_path / "inertia-cache.json").st_mtime_ns
+        os.utime(tmp_path / "manifest.json", ns=(cache_mtime + 10**9,) * 2)
+        with app.app_context():
+            assert inertia.get_manifest() == rebuilt
+            assert get_asset_version() == compute_asset_version()
+            assert get_asset_version() != "deployed"
+
+    def test_rebuilding_is_per_thread(self, tmp_path):
+        path = tmp_path / "inertia-cache.json"
+        path.write_text(json.dumps({"versions": {"": "v1"}}))
+        artifacts = SharedArtifacts()
+        seen = []
+        with artifacts.rebuilding():
+            assert artifacts.get_version(str(path), None) is None
+            thread = threading.Thread(
+                target=lambda: seen.append(artifacts.get_version(str(path), None))
+            )
+            thread.start()
+            thread.join()
+        assert seen == ["v1"]
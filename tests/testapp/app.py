@@ -1,8 +1,21 @@
 from time import sleep
 
-from flask import Blueprint, Flask
-
-from inertia_flask import Inertia, clear_history, defer, encrypt_history, inertia, merge
+from flask import Blueprint, Flask, redirect, session
+
+from inertia_flask import (
+    Inertia,
+    cached,
+    clear_history,
+    defer,
+    encrypt_history,
+    flash,
+    inertia,
+    merge,
+    once,
+    raw_json,
+    scroll,
+    with_errors,
+)
 from tests.testapp.blueprint.bp import bp
 
 
@@ -92,6 +105,71 @@ def create_app():
             "numbers": merge([1]),
         }
 
+    @app.route("/once")
+    @inertia("component")
+    def once_page():
+        def get_locale():
+            app.config["ONCE_CALLS"] = app.config.get("ONCE_CALLS", 0) + 1
+            return {"hello": "Hello"}
+
+        return {
+            "name": "Alice",
+            "locale": once(get_locale),
+            "permissions": once(lambda: ["read"], key="perms", expires_in=60),
+        }
+
+    @app.route("/cached")
+    @inertia("component")
+    def cached_page():
+        def get_posts():
+            app.config["CACHED_CALLS"] = app.config.get("CACHED_CALLS", 0) + 1
+            return [{"id": 1}]
+
+        return {
+            "name": "Alice",
+            "posts": cached(get_posts, key="posts", tags="posts"),
+            "archive": cached(defer(get_posts, group="archive"), key="archive"),
+        }
+
+    @app.route("/raw-json")
+    @inertia("component")
+    def raw_json_page():
+        return {
+            "name": "Alice",
+            "posts": raw_json(b'[{"id": 1, "title": "Hello"}]'),
+            "user": defer(lambda: raw_json('{"id": 2}')),
+        }
+
+    @app.route("/scroll")
+    @inertia("component")
+    def scroll_page():
+        return {
+            "users": scroll(
+                ({"id": i} for i in range(1, 8)), per_page=3, match_on="id"
+            ),
+            "tags": merge(["new"], prepend=True),
+            "settings": merge({"theme": "dark"}, deep=True),
+        }
+
+    @app.route("/stream")
+    @inertia("component", stream=True)
+    def stream_page():
+        return {
+            "name": "Alice",
+            "rows": ({"id": i, 1: True} for i in range(3)),
+            "numbers": merge([1]),
+        }
+
+    @app.route("/prerender")
+    @inertia("component", prerender=True)
+    def prerender_page():
+        return {"name": "Alice"}
+
+    @app.route("/prerender-session")
+    @inertia("component", prerender=True)
+    def prerender_session():
+        return {"visits": session.get("visits", 0)}
+
     @app.route("/encrypt-decorator")
     @inertia("component", encrypt=True)
     def encrypt_decorator():
@@ -103,6 +181,33 @@ def create_app():
         clear_history()
         return {}
 
+    @app.route("/clear-redirect")
+    def clear_redirect():
+        clear_history()
+        return redirect("/clear-target")
+
+    @app.route("/clear-target")
+    @inertia("component")
+    def clear_target():
+        return {}
+
+    @app.route("/flash", methods=["PUT"])
+    def flash_update():
+        flash("Saved", "success")
+        with_errors({"name": "Name is required"})
+        with_errors({"email": "Email is invalid"}, bag="login")
+        return redirect("/flash-target")
+
+    @app.route("/flash-login", methods=["PUT"])
+    def flash_login():
+        with_errors({"email": "Email is invalid"}, bag="login")
+        return redirect("/flash-target")
+
+    @app.route("/flash-target")
+    @inertia("component")
+    def flash_target():
+        return {}
+
     @app.route("/clear-decorator")
     @inertia("component", clear=True)
     def clear_decorator():